@@ -7781,11 +7781,24 @@
 
 import os
 import json
+import asyncio
+import functools
+import base64
+import io
 import uuid
+import hashlib
+import shutil
 import re
 import unicodedata
-import tempfile
-import shutil
+import threading
+import time
+import queue
+import sqlite3
+import multiprocessing
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 
@@ -7799,12 +7812,16 @@ from fastapi import (
     status,
     UploadFile,
     File,
+    BackgroundTasks,
+    WebSocket,
+    WebSocketDisconnect,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 
+import numpy as np
 from pydantic import BaseModel
 
 from qdrant_client import QdrantClient
@@ -7816,14 +7833,16 @@ from qdrant_client.models import (
     FieldCondition,
     MatchText,
 )
-from qdrant_client.http import models as qm  # noqa: F401
+from qdrant_client.http import models as qm
 
-from sentence_transformers import SentenceTransformer
-from fastembed import TextEmbedding
-from groq import Groq
-from googletrans import Translator
+try:  # backend/ as a package (uvicorn backend.app:app) or as the cwd (uvicorn app:app)
+    from . import asr_worker
+except ImportError:
+    import asr_worker
 
-from faster_whisper import WhisperModel
+# NOTE: heavy model libraries (sentence_transformers, fastembed, groq,
+# googletrans, faster_whisper) are imported lazily inside the model
+# registry loaders below, so auth-only workers never pay for them.
 from gtts import gTTS
 
 from sqlmodel import Field, SQLModel, Session, create_engine, select
@@ -7839,6 +7858,11 @@ SCHEMES_PATH = BASE_DIR / "samaj_kalyan_vibhag_clean_typed.json"
 
 TTS_OUTPUT_DIR = BASE_DIR / "tts_output"
 TTS_OUTPUT_DIR.mkdir(exist_ok=True)
+# bounded audio store: LRU (by last access) over a size budget, plus max age
+TTS_MAX_BYTES = int(os.getenv("TTS_MAX_MB", "1024")) * 1024 * 1024
+TTS_MAX_AGE_SEC = int(os.getenv("TTS_MAX_AGE_DAYS", "30")) * 24 * 3600
+TTS_MIN_KEEP_SEC = int(os.getenv("TTS_MIN_KEEP_SEC", "600"))  # never evict freshly served audio
+TTS_JANITOR_INTERVAL = int(os.getenv("TTS_JANITOR_INTERVAL", "300"))  # seconds
 
 load_dotenv()
 
@@ -7850,33 +7874,491 @@ if not GROQ_API_KEY:
 LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
 GROQ_MODEL_DOCS = os.getenv("GROQ_MODEL", LLM_MODEL)
 
-groq_client = Groq(api_key=GROQ_API_KEY)
+# UI languages answered in ONE LLM call (target-language rules folded into
+# the generation prompt); the rest are generated in Hindi, then translated.
+SINGLE_PASS_LANGS = {
+    lang.strip()
+    for lang in os.getenv("SINGLE_PASS_LANGS", "hi,hinglish,garhwali").split(",")
+    if lang.strip()
+}
+# /ask/stream two-pass: translate at least this many characters per call
+# (a paragraph break always flushes)
+STREAM_TRANSLATE_MIN_CHARS = int(os.getenv("STREAM_TRANSLATE_MIN_CHARS", "200"))
 
 # ---- DOCS RAG Qdrant ----
 DOC_QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 DOC_QDRANT_API_KEY = os.getenv("QDRANT_API_KEY") or None
 DOC_COLLECTION = os.getenv("COLLECTION_NAME", "panchayat_uk_docs")
-
-doc_qclient = QdrantClient(url=DOC_QDRANT_URL, api_key=DOC_QDRANT_API_KEY)
-doc_embedder = TextEmbedding()
+# batched retrieval (offline eval, FAQ builder)
+DOCS_EMBED_BATCH_SIZE = int(os.getenv("DOCS_EMBED_BATCH_SIZE", "256"))
+DOCS_SEARCH_BATCH_SIZE = int(os.getenv("DOCS_SEARCH_BATCH_SIZE", "64"))
+DOCS_BATCH_MAX_QUERIES = int(os.getenv("DOCS_BATCH_MAX_QUERIES", "1000"))
+# prompt packing for docs answers (approx. tokens)
+DOCS_CONTEXT_TOKEN_BUDGET = int(os.getenv("DOCS_CONTEXT_TOKEN_BUDGET", "1800"))
+DOCS_HISTORY_TOKEN_BUDGET = int(os.getenv("DOCS_HISTORY_TOKEN_BUDGET", "600"))
+DOCS_DEDUPE_SIM = float(os.getenv("DOCS_DEDUPE_SIM", "0.95"))
+# optional cross-encoder rerank: over-fetch, score on CPU, keep the best few
+DOCS_RERANK_ENABLED = os.getenv("DOCS_RERANK_ENABLED", "0") == "1"
+DOCS_RERANK_MODEL = os.getenv("DOCS_RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+DOCS_RERANK_QUANTIZE = os.getenv("DOCS_RERANK_QUANTIZE", "1") == "1"  # int8 Linear layers
+DOCS_RERANK_FETCH = int(os.getenv("DOCS_RERANK_FETCH", "24"))
+DOCS_RERANK_KEEP = int(os.getenv("DOCS_RERANK_KEEP", "5"))
+DOCS_RERANK_BATCH = int(os.getenv("DOCS_RERANK_BATCH", "8"))
+DOCS_RERANK_BUDGET_MS = int(os.getenv("DOCS_RERANK_BUDGET_MS", "300"))
+DOCS_RERANK_MIN_SCORE = float(os.getenv("DOCS_RERANK_MIN_SCORE", "0.05"))  # sigmoid prob
 
 # ---- Schemes Qdrant (local) ----
 EMBED_MODEL_NAME_SCHEMES = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 SCHEMES_COLLECTION = "samaj_kalyan_vibhag_schemes"
 
-scheme_embed_model = SentenceTransformer(EMBED_MODEL_NAME_SCHEMES)
-scheme_qdrant = QdrantClient(path=str(BASE_DIR / "qdrant_data"))
+# "qdrant" = local-mode Qdrant (default), "memory" = NumPy matrix snapshot
+# (read-only, mmap-shared between uvicorn workers, no qdrant_data lock)
+SCHEMES_VECTOR_ENGINE = os.getenv("SCHEMES_VECTOR_ENGINE", "qdrant").lower()
+SCHEMES_SNAPSHOT_DIR = BASE_DIR / "schemes_index"
+
+# "dense" = embeddings only, "hybrid" = BM25 + dense fused with RRF
+SCHEMES_RETRIEVAL_MODE = os.getenv("SCHEMES_RETRIEVAL_MODE", "dense").lower()
+RRF_K = int(os.getenv("RRF_K", "60"))
+# exact / fuzzy scheme-name lookup before any embedding work: a hit is
+# returned directly, the query is never encoded
+SCHEMES_NAME_FASTPATH = os.getenv("SCHEMES_NAME_FASTPATH", "1") == "1"
+# _final_score of a name hit (>= the 0.60 "clearly a scheme" routing bar)
+SCHEMES_NAME_SCORE = float(os.getenv("SCHEMES_NAME_SCORE", "1.0"))
+# candidates fetched beyond page*limit, so keyword boosts can still reorder
+SCHEMES_FETCH_MARGIN = int(os.getenv("SCHEMES_FETCH_MARGIN", "10"))
+SCHEMES_MAX_FETCH = int(os.getenv("SCHEMES_MAX_FETCH", "200"))
+SCHEMES_CURSOR_TTL = int(os.getenv("SCHEMES_CURSOR_TTL", "600"))  # seconds
 
 # ---- Whisper ----
 WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL_NAME", "medium")
 USE_CUDA = os.getenv("USE_CUDA", "0") == "1"
+# streaming voice (WebSocket): re-transcribe the live window every STEP seconds
+VOICE_SAMPLE_RATE = 16000
+VOICE_STREAM_STEP_SEC = float(os.getenv("VOICE_STREAM_STEP_SEC", "1.0"))
+VOICE_STREAM_HOLDBACK_SEC = float(os.getenv("VOICE_STREAM_HOLDBACK_SEC", "1.5"))
+VOICE_ENDPOINT_SILENCE_SEC = float(os.getenv("VOICE_ENDPOINT_SILENCE_SEC", "0.8"))
+VOICE_SILENCE_RMS = float(os.getenv("VOICE_SILENCE_RMS", "0.01"))
+VOICE_STREAM_MAX_SEC = float(os.getenv("VOICE_STREAM_MAX_SEC", "60"))
+# speech worker pool: N processes, each with its own model + thread budget.
+# Off by default (0 = the single in-process model); cpu_count // 4 is a
+# reasonable starting point on a dedicated voice host.
+ASR_WORKERS = int(os.getenv("ASR_WORKERS", "0"))
+ASR_CPU_THREADS = int(
+    os.getenv("ASR_CPU_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, ASR_WORKERS))))
+)
+ASR_QUEUE_MAX = int(os.getenv("ASR_QUEUE_MAX", "32"))  # beyond this -> 503
+ASR_BATCH_SIZE = int(os.getenv("ASR_BATCH_SIZE", "4"))
+ASR_BATCH_WINDOW_MS = int(os.getenv("ASR_BATCH_WINDOW_MS", "30"))
+ASR_BATCH_MAX_SEC = float(os.getenv("ASR_BATCH_MAX_SEC", "8"))  # only clips this short are grouped
+# model-size tiering: short clips / busy periods -> smaller model,
+# low-confidence results are redone with WHISPER_MODEL_NAME
+ASR_TIERING = os.getenv("ASR_TIERING", "1") == "1"
+ASR_FAST_MODEL = os.getenv("ASR_FAST_MODEL", "small")
+ASR_FASTEST_MODEL = os.getenv("ASR_FASTEST_MODEL", "base")
+ASR_SHORT_CLIP_SEC = float(os.getenv("ASR_SHORT_CLIP_SEC", "6"))
+ASR_HIGH_LOAD = float(os.getenv("ASR_HIGH_LOAD", "1.5"))  # (queued + running) / workers
+ASR_MIN_AVG_LOGPROB = float(os.getenv("ASR_MIN_AVG_LOGPROB", "-0.8"))
+# Whisper sizes kept loaded (LRU), per pool worker and in-process alike. All
+# three tiers cost about 1.2 GB RSS with int8 on CPU; lower this on small machines.
+ASR_MAX_MODELS = int(os.getenv("ASR_MAX_MODELS", "3"))
+# in-process mode (ASR_WORKERS=0): threads of the Whisper-only executor, kept
+# apart from the /ask pool so long recordings cannot starve embeddings
+ASR_INPROCESS_THREADS = int(os.getenv("ASR_INPROCESS_THREADS", "1"))
+
+# ---- Query embedding cache ----
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "4096"))
+EMBED_CACHE_TTL = int(os.getenv("EMBED_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+# optional SQLite file for a persistent second tier, e.g. "embed_cache.db"
+EMBED_CACHE_DB = os.getenv("EMBED_CACHE_DB", "")
+
+# ---- Translation cache ----
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "2048"))
+# persistent SQLite tier; set to "" to keep translations in memory only
+TRANSLATION_CACHE_DB = os.getenv("TRANSLATION_CACHE_DB", "translation_cache.db")
+
+# ---- Semantic answer cache (/ask) ----
+# off by default: short questions naming different schemes can be very close
+# in embedding space; a hit also needs the same top retrieved schemes
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "0") == "1"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.96"))
+SEMANTIC_CACHE_SIG_SCHEMES = int(os.getenv("SEMANTIC_CACHE_SIG_SCHEMES", "3"))
+SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 3600)))  # seconds
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+
+# ---- Async ask pipeline ----
+# bounded pool for blocking work (embeddings, local index, gTTS);
+# in-process Whisper has its own executor (ASR_INPROCESS_THREADS)
+ASK_EXECUTOR_WORKERS = int(os.getenv("ASK_EXECUTOR_WORKERS", "4"))
+
+# ---- Model warm-up ----
+# Comma separated list of registry names to load in a background thread on
+# startup, e.g. "groq,scheme_embedder,schemes_index". Empty = fully lazy.
+WARMUP_MODELS = [
+    m.strip() for m in os.getenv("WARMUP_MODELS", "").split(",") if m.strip()
+]
+
+# ================== MODEL REGISTRY ==================
+# Every model / client is created the first time an endpoint needs it.
+# `/health` and `/auth/*` therefore never load Whisper or the embedders.
+
+_MODELS: Dict[str, Any] = {}
+_MODEL_LOCKS: Dict[str, threading.Lock] = {}
+_MODEL_LOCKS_GUARD = threading.Lock()
+
+
+def _get_model(name: str):
+    model = _MODELS.get(name)
+    if model is not None:
+        return model
+
+    with _MODEL_LOCKS_GUARD:
+        lock = _MODEL_LOCKS.setdefault(name, threading.Lock())
+
+    with lock:
+        model = _MODELS.get(name)
+        if model is None:
+            model = _MODEL_LOADERS[name]()
+            _MODELS[name] = model
+            print(f"✅ Loaded model: {name}")
+    return model
+
+
+def _load_groq_async():
+    from groq import AsyncGroq
+
+    return AsyncGroq(api_key=GROQ_API_KEY)
+
+
+def _load_translator():
+    from googletrans import Translator
+
+    return Translator()
+
+
+def _load_doc_qclient():
+    return QdrantClient(url=DOC_QDRANT_URL, api_key=DOC_QDRANT_API_KEY)
+
+
+def _load_doc_qclient_async():
+    from qdrant_client import AsyncQdrantClient
+
+    return AsyncQdrantClient(url=DOC_QDRANT_URL, api_key=DOC_QDRANT_API_KEY)
+
+
+def _load_doc_embedder():
+    from fastembed import TextEmbedding
+
+    return TextEmbedding()
+
+
+def _load_scheme_embedder():
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBED_MODEL_NAME_SCHEMES)
+
+
+def _load_scheme_qdrant():
+    return QdrantClient(path=str(BASE_DIR / "qdrant_data"))
+
+
+def _load_schemes_index():
+    init_schemes_collection()
+    return True
+
+
+def _load_scheme_memory_index():
+    return load_scheme_memory_index()
+
+
+def _load_scheme_lexical_index():
+    return SchemeLexicalIndex(load_schemes())
+
+
+def _load_scheme_bm25_index():
+    return SchemeBM25Index(load_schemes())
+
+
+def _load_scheme_name_index():
+    return SchemeNameIndex(load_schemes())
+
+
+def _load_docs_reranker():
+    from sentence_transformers import CrossEncoder
+
+    model = CrossEncoder(DOCS_RERANK_MODEL, max_length=384, device="cpu")
+    if DOCS_RERANK_QUANTIZE:
+        import torch
+
+        model.model = torch.quantization.quantize_dynamic(
+            model.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+def _load_whisper():
+    return asr_worker.load_model(
+        WHISPER_MODEL_NAME,
+        device="cuda" if USE_CUDA else "cpu",
+        compute_type="float16" if USE_CUDA else "int8",
+    )
+
+
+def _load_asr_pool():
+    return SpeechWorkerPool(ASR_WORKERS, ASR_CPU_THREADS)
+
+
+_MODEL_LOADERS = {
+    "groq_async": _load_groq_async,
+    "translator": _load_translator,
+    "doc_qclient": _load_doc_qclient,
+    "doc_qclient_async": _load_doc_qclient_async,
+    "doc_embedder": _load_doc_embedder,
+    "scheme_embedder": _load_scheme_embedder,
+    "scheme_qdrant": _load_scheme_qdrant,
+    "schemes_index": _load_schemes_index,
+    "scheme_memory_index": _load_scheme_memory_index,
+    "scheme_lexical_index": _load_scheme_lexical_index,
+    "scheme_bm25_index": _load_scheme_bm25_index,
+    "scheme_name_index": _load_scheme_name_index,
+    "docs_reranker": _load_docs_reranker,
+    "whisper": _load_whisper,
+    "asr_pool": _load_asr_pool,
+}
+
+
+def get_async_groq_client():
+    return _get_model("groq_async")
+
+
+def get_translator():
+    return _get_model("translator")
+
+
+def get_doc_qclient() -> QdrantClient:
+    return _get_model("doc_qclient")
+
+
+def get_async_doc_qclient():
+    return _get_model("doc_qclient_async")
 
-whisper_model = WhisperModel(
-    WHISPER_MODEL_NAME,
-    device="cuda" if USE_CUDA else "cpu",
-    compute_type="float16" if USE_CUDA else "int8",
+
+def get_doc_embedder():
+    return _get_model("doc_embedder")
+
+
+def get_scheme_embed_model():
+    return _get_model("scheme_embedder")
+
+
+def get_scheme_qdrant() -> QdrantClient:
+    return _get_model("scheme_qdrant")
+
+
+def ensure_schemes_index() -> None:
+    _get_model("schemes_index")
+
+
+def get_scheme_memory_index() -> "InMemorySchemeIndex":
+    return _get_model("scheme_memory_index")
+
+
+def get_scheme_lexical_index() -> "SchemeLexicalIndex":
+    return _get_model("scheme_lexical_index")
+
+
+def get_scheme_bm25_index() -> "SchemeBM25Index":
+    return _get_model("scheme_bm25_index")
+
+
+def get_scheme_name_index() -> "SchemeNameIndex":
+    return _get_model("scheme_name_index")
+
+
+def get_docs_reranker():
+    return _get_model("docs_reranker")
+
+
+def get_whisper_model():
+    return _get_model("whisper")
+
+
+def get_asr_pool() -> "SpeechWorkerPool":
+    return _get_model("asr_pool")
+
+
+def _warmup_models(names: List[str]) -> None:
+    for name in names:
+        if name not in _MODEL_LOADERS:
+            print(f"⚠️ Unknown model in WARMUP_MODELS: {name}")
+            continue
+        try:
+            _get_model(name)
+        except Exception as e:
+            print(f"⚠️ Warm-up failed for {name}: {e}")
+
+
+# ================== BLOCKING WORK EXECUTOR ==================
+
+_ask_executor = ThreadPoolExecutor(
+    max_workers=ASK_EXECUTOR_WORKERS, thread_name_prefix="ask-worker"
 )
 
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run CPU / blocking I/O work off the event loop in the bounded pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ask_executor, functools.partial(fn, *args, **kwargs))
+
+
+def _discard_task(task: "asyncio.Task") -> None:
+    # cancel a speculative task without "exception never retrieved" warnings
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+# ================== QUERY EMBEDDING CACHE ==================
+
+
+class EmbeddingCache:
+    """
+    LRU + TTL cache for query vectors keyed by (model name, normalised text),
+    with an optional persistent SQLite tier.
+    """
+
+    def __init__(self, max_size: int, ttl: int, db_path: str = ""):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._mem: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                    "model TEXT, text TEXT, created REAL, vec BLOB, "
+                    "PRIMARY KEY (model, text))"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ embedding cache DB {db_path} unusable, memory only:", e)
+                self._db = None
+
+    def _disk_get(self, key: Tuple[str, str]) -> Optional[Tuple[float, np.ndarray]]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT created, vec FROM query_embeddings WHERE model = ? AND text = ?",
+                key,
+            ).fetchone()
+        except sqlite3.Error as e:
+            # locked / corrupt file: behave like a miss, the in-memory LRU still works
+            print("⚠️ embedding cache read failed:", e)
+            return None
+        if row is None:
+            return None
+        return row[0], np.frombuffer(row[1], dtype=np.float32)
+
+    def _disk_put(self, key: Tuple[str, str], created: float, vec: np.ndarray) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?, ?)",
+                (key[0], key[1], created, vec.tobytes()),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print("⚠️ embedding cache write failed:", e)
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        key = (model_name, _norm(text))
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is None:
+                entry = self._disk_get(key)
+                if entry is not None and now - entry[0] <= self.ttl:
+                    self.disk_hits += 1
+                    self._mem[key] = entry
+            if entry is None or now - entry[0] > self.ttl:
+                self._mem.pop(key, None)
+                self.misses += 1
+                return None
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, model_name: str, text: str, vec) -> np.ndarray:
+        key = (model_name, _norm(text))
+        vec = np.asarray(vec, dtype=np.float32)
+        created = time.time()
+        with self._lock:
+            self._mem[key] = (created, vec)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_size:
+                self._mem.popitem(last=False)
+            self._disk_put(key, created, vec)
+        return vec
+
+    def get_or_compute(self, model_name: str, text: str, compute) -> np.ndarray:
+        vec = self.get(model_name, text)
+        if vec is None:
+            vec = self.put(model_name, text, compute(text))
+        return vec
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._mem),
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+query_embed_cache = EmbeddingCache(EMBED_CACHE_SIZE, EMBED_CACHE_TTL, EMBED_CACHE_DB)
+
+
+def embed_scheme_query(text: str) -> np.ndarray:
+    return query_embed_cache.get_or_compute(
+        EMBED_MODEL_NAME_SCHEMES,
+        text,
+        lambda t: get_scheme_embed_model().encode(t),
+    )
+
+
+DOC_EMBED_CACHE_MODEL = "fastembed:default"
+
+
+def embed_doc_query(text: str) -> np.ndarray:
+    return query_embed_cache.get_or_compute(
+        DOC_EMBED_CACHE_MODEL,
+        text,
+        lambda t: list(get_doc_embedder().embed([t]))[0],
+    )
+
+
+def embed_doc_queries(texts: List[str]) -> List[np.ndarray]:
+    """Cache hits are reused; all misses go through ONE fastembed batch."""
+    vecs: List[Optional[np.ndarray]] = [
+        query_embed_cache.get(DOC_EMBED_CACHE_MODEL, t) for t in texts
+    ]
+    missing = [i for i, v in enumerate(vecs) if v is None]
+    if missing:
+        computed = get_doc_embedder().embed(
+            [texts[i] for i in missing], batch_size=DOCS_EMBED_BATCH_SIZE
+        )
+        for i, vec in zip(missing, computed):
+            vecs[i] = query_embed_cache.put(DOC_EMBED_CACHE_MODEL, texts[i], vec)
+    return vecs
+
+
 # ---- FastAPI ----
 app = FastAPI(title="Panchayat Sahayika Unified Backend")
 
@@ -7888,10 +8370,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.mount("/tts", StaticFiles(directory=str(TTS_OUTPUT_DIR)), name="tts")
+class _TrackedStaticFiles(StaticFiles):
+    """StaticFiles that tells the TTS store a file was played (LRU access time)."""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            tts_store.touch(path)
+        return response
+
+
+app.mount("/tts", _TrackedStaticFiles(directory=str(TTS_OUTPUT_DIR)), name="tts")
 
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-translator = Translator()
 
 # ================== AUTH / USERS ==================
 
@@ -7981,6 +8472,13 @@ class Token(SQLModel):
     token_type: str = "bearer"
 
 
+class UserRecommendation(SQLModel, table=True):
+    user_id: int = Field(primary_key=True, foreign_key="user.id")
+    index_fingerprint: str
+    cards_json: str
+    updated_at: float
+
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
@@ -8040,6 +8538,18 @@ async def get_current_user(
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
+    if WARMUP_MODELS:
+        threading.Thread(
+            target=_warmup_models, args=(WARMUP_MODELS,), daemon=True
+        ).start()
+    threading.Thread(target=tts_store.janitor_loop, daemon=True, name="tts-janitor").start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    pool = _MODELS.get("asr_pool")
+    if pool is not None:
+        pool.shutdown()
 
 # ================== COMMON LANGUAGE + VOICE HELPERS ==================
 
@@ -8051,7 +8561,7 @@ def contains_devanagari(text: str) -> bool:
     return False
 
 
-def _llm_translate(text: str, target_desc: str) -> str:
+def _llm_translate_messages(text: str, target_desc: str) -> List[Dict[str, str]]:
     system_msg = (
         "You are a translator for Gram Panchayat content.\n"
         "You ONLY translate / rewrite the text; you do not add explanations.\n"
@@ -8064,20 +8574,24 @@ def _llm_translate(text: str, target_desc: str) -> str:
         f"Text:\n{text}"
     )
 
-    completion = groq_client.chat.completions.create(
+    return [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": user_msg},
+    ]
+
+
+async def _llm_translate_async(text: str, target_desc: str) -> Optional[str]:
+    """None when the model returned nothing (caller falls back to the input)."""
+    completion = await get_async_groq_client().chat.completions.create(
         model=LLM_MODEL,
-        messages=[
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_msg},
-        ],
+        messages=_llm_translate_messages(text, target_desc),
         temperature=0.25,
         max_tokens=1200,
     )
-    out = completion.choices[0].message.content or text
-    return out
+    return completion.choices[0].message.content or None
 
 
-def translate_answer(text: str, target_lang: str) -> str:
+def _translation_target_desc(target_lang: str) -> str:
     """
     target_lang:
       - 'en'        -> English
@@ -8088,108 +8602,844 @@ def translate_answer(text: str, target_lang: str) -> str:
 
     # ---------- English ----------
     if target_lang == "en":
-        try:
-            res = translator.translate(text, dest="en")
-            out = res.text
-            if out and not contains_devanagari(out) and out.strip():
-                return out
-        except Exception:
-            pass
-
-        return _llm_translate(
-            text,
+        return (
             "clear, simple English suitable for village-level users. "
-            "Avoid Hindi script and use plain English sentences.",
+            "Avoid Hindi script and use plain English sentences."
         )
 
     # ---------- Hindi ----------
     if target_lang == "hi":
-        return _llm_translate(
-            text,
+        return (
             "very simple Hindi in Devanagari script, using everyday words "
-            "that village-level users understand.",
+            "that village-level users understand."
         )
 
     # ---------- Garhwali ----------
-        # ---------- Garhwali ----------
     if target_lang == "garhwali":
-        return _llm_translate(
-            text,
-            (
-                "PURE Central Garhwali (Pauri / Chamoli region) in Devanagari script only. "
-                "Rewrite every sentence from simple Hindi into natural village-style Garhwali speech.\n"
-                "\n"
-                "STRICT RULES:\n"
-                "1) Replace Hindi helper verbs like 'hai, hain, tha, thi, the, hoga, karna, karna hai' "
-                "with Garhwali forms like 'ch, chan, rai, hondu ch, karanu, karno padul'.\n"
-                "2) Use Garhwali pronouns: aap/tum -> 'tyun/tumi', aapka -> 'tyunr', aapko -> 'tyunku/tyunla', "
-                "mera -> 'mer', meri -> 'meri', yahan -> 'yan', wahan -> 'tyan'.\n"
-                "3) Style must sound like real village speech, not formal Hindi or legal language.\n"
-                "4) Do NOT translate names of schemes or departments such as "
-                "'प्रधानमंत्री आवास योजना', 'राष्ट्रीय पशुधन मिशन', 'Panchayati Raj Vibhag', "
-                "'CSC Center', 'Uttarakhand Jal Sansthan' – keep them as they are inside the sentence.\n"
-                "5) Never leave any line in plain Hindi; rewrite every line in Garhwali.\n"
-                "6) Never use English letters (Roman script); use Devanagari only.\n"
-                "7) Tone should be warm, simple, and like a normal Gaon ki boli.\n"
-                "\n"
-                "PROJECT EXAMPLES:\n"
-                "Hindi: 'यह योजना महिलाओं के लिए है।'\n"
-                "Garhwali: 'य योजना महिलां मनुक लागि च.'\n"
-                "Hindi: 'विधवा पेंशन के लिए आपको CSC में आवेदन करना होगा।'\n"
-                "Garhwali: 'विधवा पेंशन लागि त्यूँकु CSC म आवेदन करणो पडुल.'\n"
-                "Hindi: 'आय प्रमाणपत्र के लिए पटवारी से मिलें।'\n"
-                "Garhwali: 'आय प्रमाणपत्र लागि पटवारी स्यूँ मिलौ.'\n"
-                "Hindi: 'पीने के पानी की समस्या के लिए जल संस्थान से संपर्क करें।'\n"
-                "Garhwali: 'पीणखाल पाणी कु झमेलो लागि Uttarakhand Jal Sansthan स्यूँ संपर्क करदी.'\n"
-                "Hindi: 'तलाक के लिए आवेदन करने से पहले पति से बात करनी चाहिए।'\n"
-                "Garhwali: 'तलाक लागि आवेदन करणै स्यूँ पहलु त्यूँर पतिक संग बोलबात करणु चाहिणु.'\n"
-                "\n"
-                "Return ONLY the final Garhwali version of the text, with no Hindi or English explanation."
-            ),
+        return (
+            "PURE Central Garhwali (Pauri / Chamoli region) in Devanagari script only. "
+            "Rewrite every sentence from simple Hindi into natural village-style Garhwali speech.\n"
+            "\n"
+            "STRICT RULES:\n"
+            "1) Replace Hindi helper verbs like 'hai, hain, tha, thi, the, hoga, karna, karna hai' "
+            "with Garhwali forms like 'ch, chan, rai, hondu ch, karanu, karno padul'.\n"
+            "2) Use Garhwali pronouns: aap/tum -> 'tyun/tumi', aapka -> 'tyunr', aapko -> 'tyunku/tyunla', "
+            "mera -> 'mer', meri -> 'meri', yahan -> 'yan', wahan -> 'tyan'.\n"
+            "3) Style must sound like real village speech, not formal Hindi or legal language.\n"
+            "4) Do NOT translate names of schemes or departments such as "
+            "'प्रधानमंत्री आवास योजना', 'राष्ट्रीय पशुधन मिशन', 'Panchayati Raj Vibhag', "
+            "'CSC Center', 'Uttarakhand Jal Sansthan' – keep them as they are inside the sentence.\n"
+            "5) Never leave any line in plain Hindi; rewrite every line in Garhwali.\n"
+            "6) Never use English letters (Roman script); use Devanagari only.\n"
+            "7) Tone should be warm, simple, and like a normal Gaon ki boli.\n"
+            "\n"
+            "PROJECT EXAMPLES:\n"
+            "Hindi: 'यह योजना महिलाओं के लिए है।'\n"
+            "Garhwali: 'य योजना महिलां मनुक लागि च.'\n"
+            "Hindi: 'विधवा पेंशन के लिए आपको CSC में आवेदन करना होगा।'\n"
+            "Garhwali: 'विधवा पेंशन लागि त्यूँकु CSC म आवेदन करणो पडुल.'\n"
+            "Hindi: 'आय प्रमाणपत्र के लिए पटवारी से मिलें।'\n"
+            "Garhwali: 'आय प्रमाणपत्र लागि पटवारी स्यूँ मिलौ.'\n"
+            "Hindi: 'पीने के पानी की समस्या के लिए जल संस्थान से संपर्क करें।'\n"
+            "Garhwali: 'पीणखाल पाणी कु झमेलो लागि Uttarakhand Jal Sansthan स्यूँ संपर्क करदी.'\n"
+            "Hindi: 'तलाक के लिए आवेदन करने से पहले पति से बात करनी चाहिए।'\n"
+            "Garhwali: 'तलाक लागि आवेदन करणै स्यूँ पहलु त्यूँर पतिक संग बोलबात करणु चाहिणु.'\n"
+            "\n"
+            "Return ONLY the final Garhwali version of the text, with no Hindi or English explanation."
         )
 
-
     # ---------- Hinglish ----------
-    return _llm_translate(
-        text,
+    return (
         "very simple Hinglish (Roman Hindi using English letters). "
-        "Do NOT use Devanagari characters.",
+        "Do NOT use Devanagari characters."
+    )
+
+
+def _output_language_rules(target_lang: Optional[str]) -> str:
+    """
+    Prompt block for single-pass generation; "" when the model should write
+    the usual simple Hindi (target 'hi', or two-pass translation).
+    """
+    if not target_lang or target_lang == "hi":
+        return ""
+    return (
+        "OUTPUT LANGUAGE (this overrides every instruction above about writing in Hindi): "
+        "write the ENTIRE answer, including the closing line and any summary sentence, "
+        f"directly in {_translation_target_desc(target_lang)}"
     )
 
 
+def _single_pass_lang(target_lang: str) -> Optional[str]:
+    return target_lang if target_lang in SINGLE_PASS_LANGS else None
+
+
+async def _localize_static(text: str, target_lang: Optional[str]) -> str:
+    # canned Hindi texts (no-match / no-LLM fallbacks) in single-pass mode
+    if not target_lang or target_lang == "hi":
+        return text
+    return await translate_answer_async(text, target_lang)
+
+
+def _google_translate_en(text: str) -> Optional[str]:
+    try:
+        res = get_translator().translate(text, dest="en")
+        out = res.text
+        if out and not contains_devanagari(out) and out.strip():
+            return out
+    except Exception:
+        pass
+    return None
+
+
+class TranslationCache:
+    """
+    Content-addressed translations keyed by (sha256 of text, target_lang,
+    prompt version): in-memory LRU plus an optional persistent SQLite tier.
+    """
+
+    def __init__(self, max_size: int, db_path: str = ""):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._mem: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "text_hash TEXT, target_lang TEXT, prompt_version TEXT, "
+                "translated TEXT, created REAL, "
+                "PRIMARY KEY (text_hash, target_lang, prompt_version))"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _key(text: str, target_lang: str) -> Tuple[str, str, str]:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return text_hash, target_lang, _translation_prompt_version(target_lang)
+
+    def get(self, text: str, target_lang: str) -> Optional[str]:
+        key = self._key(text, target_lang)
+        with self._lock:
+            out = self._mem.get(key)
+            if out is None and self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT translated FROM translations "
+                        "WHERE text_hash = ? AND target_lang = ? AND prompt_version = ?",
+                        key,
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print("⚠️ translation cache read failed:", e)
+                    row = None
+                if row is not None:
+                    out = row[0]
+                    self.disk_hits += 1
+                    self._mem[key] = out
+            if out is None:
+                self.misses += 1
+                return None
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return out
+
+    def put(self, text: str, target_lang: str, translated: str) -> None:
+        """Best effort: a busy / locked SQLite file only costs the disk tier."""
+        key = self._key(text, target_lang)
+        with self._lock:
+            self._mem[key] = translated
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_size:
+                self._mem.popitem(last=False)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                        key + (translated, time.time()),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print("⚠️ translation cache write failed:", e)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._mem),
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+@functools.lru_cache(maxsize=16)
+def _translation_prompt_version(target_lang: str) -> str:
+    # changes automatically whenever the translation prompt or model changes
+    messages = _llm_translate_messages("", _translation_target_desc(target_lang))
+    raw = LLM_MODEL + "|" + json.dumps(messages, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+translation_cache = TranslationCache(TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_DB)
+
+
+async def translate_answer_async(text: str, target_lang: str) -> str:
+    # SQLite tier is blocking I/O: keep it off the event loop
+    cached = await run_blocking(translation_cache.get, text, target_lang)
+    if cached is not None:
+        return cached
+
+    out = None
+    if target_lang == "en":
+        out = await run_blocking(_google_translate_en, text)
+    if not out:
+        out = await _llm_translate_async(text, _translation_target_desc(target_lang))
+    if not out:
+        return text  # untranslated input: serve it, but never cache it
+
+    await run_blocking(translation_cache.put, text, target_lang, out)
+    return out
+
+
 def _convert_markdown_bold_to_html(text: str) -> str:
     return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
 
 
-def transcribe_garhwali_audio(path: str) -> str:
-    segments, info = whisper_model.transcribe(
-        path,
-        language="hi",
-        task="transcribe",
-        vad_filter=True,
+_inprocess_asr_active = 0
+_inprocess_asr_lock = threading.Lock()
+# registry keys of in-process Whisper sizes, least recently used first
+_inprocess_whisper_lru: "OrderedDict[str, None]" = OrderedDict()
+_asr_executor = ThreadPoolExecutor(
+    max_workers=max(1, ASR_INPROCESS_THREADS), thread_name_prefix="asr-worker"
+)
+
+
+def _get_whisper_by_name(name: str):
+    """
+    In-process model of a given size; extra sizes join the registry as
+    whisper:<name>. At most ASR_MAX_MODELS sizes stay loaded (LRU).
+    """
+    if name == WHISPER_MODEL_NAME:
+        key = "whisper"
+    else:
+        key = f"whisper:{name}"
+        _MODEL_LOADERS.setdefault(
+            key,
+            functools.partial(
+                asr_worker.load_model,
+                name,
+                device="cuda" if USE_CUDA else "cpu",
+                compute_type="float16" if USE_CUDA else "int8",
+            ),
+        )
+    with _inprocess_asr_lock:
+        _inprocess_whisper_lru[key] = None
+        _inprocess_whisper_lru.move_to_end(key)
+        while len(_inprocess_whisper_lru) > max(1, ASR_MAX_MODELS):
+            evicted, _ = _inprocess_whisper_lru.popitem(last=False)
+            _MODELS.pop(evicted, None)  # running transcriptions keep their reference
+    return _get_model(key)
+
+
+def _transcribe_inprocess(audio, model_name: str):
+    return asr_worker.run_whisper_scored(_get_whisper_by_name(model_name), audio)
+
+
+# ================== SPEECH WORKER POOL ==================
+
+
+class SpeechPoolBusy(Exception):
+    """The speech pool cannot serve the clip now (queue full / workers restarting); retry."""
+
+
+class SpeechWorkerPool:
+    """
+    Whisper in `workers` processes (spawned, see asr_worker.py), each with
+    its own model and `cpu_threads`. Requests wait in a bounded queue
+    (full -> HTTP 503). One dispatcher thread hands a free worker either a
+    single long clip or up to ASR_BATCH_SIZE short ones (collected for at
+    most ASR_BATCH_WINDOW_MS), and never more tasks than there are workers,
+    so queue_depth is the real backlog.
+
+    If a worker process dies (OOM kill, segfault) the executor is rebuilt;
+    only the batches that were running at that moment fail (SpeechPoolBusy),
+    queued requests go to the fresh processes.
+    """
+
+    def __init__(self, workers: int, cpu_threads: int):
+        self.workers = workers
+        self.cpu_threads = cpu_threads
+        self._queue: "queue.Queue" = queue.Queue(maxsize=ASR_QUEUE_MAX)
+        self._pending = None  # long clip pulled while collecting a batch
+        self._slots = threading.Semaphore(workers)
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.restarts = 0
+        self._wait_total = 0.0
+        self._service_total = 0.0
+        threading.Thread(target=self._dispatch_loop, daemon=True, name="asr-dispatch").start()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=asr_worker.init_worker,
+            initargs=(
+                "cuda" if USE_CUDA else "cpu",
+                "float16" if USE_CUDA else "int8",
+                self.cpu_threads,
+                ASR_MAX_MODELS,
+            ),
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Swap in a fresh executor once per breakage (several callbacks may report it)."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        print("⚠️ ASR worker process died, speech pool restarted")
+
+    def submit(self, audio: np.ndarray, model_name: str = WHISPER_MODEL_NAME) -> Future:
+        fut: Future = Future()
+        try:
+            self._queue.put_nowait((audio, model_name, fut, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise SpeechPoolBusy("Speech recognition is busy, please retry")
+        return fut
+
+    @staticmethod
+    def _is_short(job) -> bool:
+        return len(job[0]) <= ASR_BATCH_MAX_SEC * VOICE_SAMPLE_RATE
+
+    def _next_batch(self) -> list:
+        first, self._pending = self._pending or self._queue.get(), None
+        batch = [first]
+        if not self._is_short(first):
+            return batch
+        deadline = time.perf_counter() + ASR_BATCH_WINDOW_MS / 1000.0
+        while len(batch) < ASR_BATCH_SIZE:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if not self._is_short(job):
+                self._pending = job
+                break
+            batch.append(job)
+        return batch
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            self._slots.acquire()
+            batch = self._next_batch()
+            started = time.perf_counter()
+            with self._lock:
+                self.in_flight += len(batch)
+                self.batches += 1
+                self._wait_total += sum(started - job[3] for job in batch)
+            jobs = [(job[0], job[1]) for job in batch]
+            executor = self._executor
+            try:
+                task = executor.submit(asr_worker.transcribe_batch, jobs)
+            except BrokenProcessPool:
+                # broke between batches: nothing of this batch ran yet, retry on a fresh pool
+                self._restart(executor)
+                executor = self._executor
+                try:
+                    task = executor.submit(asr_worker.transcribe_batch, jobs)
+                except Exception as e:
+                    self._finish(batch, started, None, e)
+                    continue
+            except Exception as e:  # pool shut down
+                self._finish(batch, started, None, e)
+                continue
+            task.add_done_callback(
+                lambda t, b=batch, s=started, ex=executor: self._on_done(t, b, s, ex)
+            )
+
+    def _on_done(self, task: Future, batch: list, started: float, executor) -> None:
+        if task.cancelled():
+            # cancel_futures=True on restart / shutdown
+            error = SpeechPoolBusy("Speech recognition restarted, please retry")
+            self._finish(batch, started, None, error)
+            return
+        error = task.exception()
+        self._finish(batch, started, None if error else task.result(), error, executor)
+
+    def _finish(self, batch: list, started: float, results, error, executor=None) -> None:
+        if isinstance(error, BrokenProcessPool):
+            if executor is not None:
+                self._restart(executor)
+            error = SpeechPoolBusy("Speech recognition restarted, please retry")
+        self._slots.release()
+        with self._lock:
+            self.in_flight -= len(batch)
+            self._service_total += time.perf_counter() - started
+            if error is None:
+                self.completed += len(batch)
+            else:
+                self.failed += len(batch)
+        for i, job in enumerate(batch):
+            if job[2].cancelled():
+                continue  # caller went away (asyncio.wrap_future cancels it)
+            if error is None:
+                job[2].set_result(results[i])
+            else:
+                job[2].set_exception(error)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def load(self) -> float:
+        """(queued + running) jobs per worker."""
+        with self._lock:
+            busy = self._queue.qsize() + (1 if self._pending else 0) + self.in_flight
+        return busy / max(1, self.workers)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "cpu_threads": self.cpu_threads,
+                "queue_depth": self._queue.qsize() + (1 if self._pending else 0),
+                "queue_max": ASR_QUEUE_MAX,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "batches": self.batches,
+                "restarts": self.restarts,
+                "avg_batch_size": round(done / self.batches, 2) if self.batches else None,
+                "avg_wait_ms": round(1000.0 * self._wait_total / done, 1) if done else None,
+                "avg_service_ms": (
+                    round(1000.0 * self._service_total / self.batches, 1) if self.batches else None
+                ),
+            }
+
+
+# ================== ASR MODEL TIERING ==================
+
+
+class AsrTierScheduler:
+    """
+    Picks the Whisper size per clip from its length and the current load:
+    short clip AND busy -> ASR_FASTEST_MODEL, short clip OR busy ->
+    ASR_FAST_MODEL, otherwise WHISPER_MODEL_NAME. Counts routes / fallbacks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routed: Dict[str, int] = {}
+        self.fallbacks = 0
+
+    def choose(self, duration: float, load: float) -> str:
+        short = duration <= ASR_SHORT_CLIP_SEC
+        busy = load >= ASR_HIGH_LOAD
+        if short and busy:
+            name = ASR_FASTEST_MODEL
+        elif short or busy:
+            name = ASR_FAST_MODEL
+        else:
+            name = WHISPER_MODEL_NAME
+        with self._lock:
+            self.routed[name] = self.routed.get(name, 0) + 1
+        return name
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self.fallbacks += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": ASR_TIERING,
+                "routed": dict(self.routed),
+                "fallbacks": self.fallbacks,
+            }
+
+
+asr_scheduler = AsrTierScheduler()
+
+
+def _asr_load() -> float:
+    if ASR_WORKERS > 0:
+        return get_asr_pool().load()
+    return _inprocess_asr_active / max(1, ASR_INPROCESS_THREADS)
+
+
+async def _transcribe_with(audio: np.ndarray, model_name: str):
+    if ASR_WORKERS > 0:
+        return await asyncio.wrap_future(get_asr_pool().submit(audio, model_name))
+    global _inprocess_asr_active
+    with _inprocess_asr_lock:
+        _inprocess_asr_active += 1  # queued + running, like the pool's load()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _asr_executor, functools.partial(_transcribe_inprocess, audio, model_name)
+        )
+    finally:
+        with _inprocess_asr_lock:
+            _inprocess_asr_active -= 1
+
+
+async def _transcribe_tiered(
+    audio: np.ndarray, fallback: bool = True
+) -> Tuple[List[Tuple[float, float, str]], bool]:
+    """
+    Returns (segments, low_confidence). low_confidence is only True when a
+    smaller model produced the segments and fallback=False skipped the redo.
+    """
+    if not ASR_TIERING:
+        segments, _logprob = await _transcribe_with(audio, WHISPER_MODEL_NAME)
+        return segments, False
+
+    model_name = asr_scheduler.choose(len(audio) / VOICE_SAMPLE_RATE, _asr_load())
+    segments, avg_logprob = await _transcribe_with(audio, model_name)
+    low_confidence = bool(
+        model_name != WHISPER_MODEL_NAME
+        and segments
+        and avg_logprob < ASR_MIN_AVG_LOGPROB
     )
-    pieces = [seg.text.strip() for seg in segments if seg.text.strip()]
-    return " ".join(pieces).strip()
+    if low_confidence and fallback:
+        asr_scheduler.record_fallback()
+        segments, _logprob = await _transcribe_with(audio, WHISPER_MODEL_NAME)
+        low_confidence = False
+    return segments, low_confidence
 
 
-def tts_garhwali(text: str) -> str:
-    safe_text = text.strip()
-    if len(safe_text) > 1500:
-        safe_text = safe_text[:1500]
+async def transcribe_audio_async(
+    audio: np.ndarray, final: bool = True
+) -> List[Tuple[float, float, str]]:
+    """
+    16 kHz float32 audio -> segments, via the worker pool (or in-process).
+    final=False (streaming partials) never pays for a fallback pass.
+    """
+    segments, _low_confidence = await _transcribe_tiered(audio, fallback=final)
+    return segments
+
+
+def decode_audio_bytes(data: bytes) -> np.ndarray:
+    """Container audio (webm/ogg/wav/mp3) -> 16 kHz mono float32, fully in memory."""
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(io.BytesIO(data), sampling_rate=VOICE_SAMPLE_RATE)
+
+
+class StreamingTranscriber:
+    """
+    Incremental Whisper over a growing audio buffer.
+
+    Each step() transcribes only the uncommitted window. Segments that end
+    more than VOICE_STREAM_HOLDBACK_SEC before the live edge are committed
+    (their text is final and the window start moves past them); the rest
+    is the current partial hypothesis. Partials may come from a smaller
+    tier, but a low-confidence window is redone with WHISPER_MODEL_NAME
+    before anything from it is committed.
+
+    fmt="pcm16": raw little-endian 16 kHz mono int16 frames.
+    anything else: a container stream (e.g. MediaRecorder webm/opus chunks),
+    re-decoded in memory from the accumulated bytes.
+    """
+
+    def __init__(self, fmt: str = "pcm16"):
+        self.fmt = fmt
+        self._buf = bytearray()
+        self.audio = np.zeros(0, dtype=np.float32)
+        self.committed: List[str] = []
+        self.committed_samples = 0
+        self.tail = ""
+
+    def feed(self, chunk: bytes) -> None:
+        self._buf.extend(chunk)
+
+    def _refresh(self) -> None:
+        if self.fmt == "pcm16":
+            usable = len(self._buf) - len(self._buf) % 2
+            self.audio = (
+                np.frombuffer(bytes(self._buf[:usable]), dtype=np.int16).astype(np.float32)
+                / 32768.0
+            )
+            return
+        try:
+            self.audio = decode_audio_bytes(bytes(self._buf))
+        except Exception:
+            # container cut mid-frame: keep the last decodable audio
+            pass
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / VOICE_SAMPLE_RATE
+
+    def text(self) -> str:
+        return " ".join(self.committed + ([self.tail] if self.tail else [])).strip()
+
+    async def _transcribe_window(self, final: bool) -> None:
+        window = self.audio[self.committed_samples :]
+        if len(window) < VOICE_SAMPLE_RATE // 10:
+            if final:
+                self.tail = ""
+            return
+        live_edge = len(window) / VOICE_SAMPLE_RATE
+        commit_before = live_edge - VOICE_STREAM_HOLDBACK_SEC
+        segments, low_confidence = await _transcribe_tiered(window, fallback=final)
+        if low_confidence and any(end <= commit_before for _s, end, _t in segments):
+            # committed text is never revisited: only commit full-model output
+            asr_scheduler.record_fallback()
+            segments, _logprob = await _transcribe_with(window, WHISPER_MODEL_NAME)
+        tail: List[str] = []
+        advance = 0.0
+        for start, end, text in segments:
+            if final or end <= commit_before:
+                self.committed.append(text)
+                advance = end
+            else:
+                tail.append(text)
+        self.committed_samples += int(advance * VOICE_SAMPLE_RATE)
+        self.tail = " ".join(tail)
+
+    async def step(self) -> str:
+        await run_blocking(self._refresh)
+        await self._transcribe_window(final=False)
+        return self.text()
+
+    async def finish(self) -> str:
+        await run_blocking(self._refresh)
+        await self._transcribe_window(final=True)
+        return self.text()
+
+    def trailing_silence(self) -> bool:
+        """Speech was heard and the last VOICE_ENDPOINT_SILENCE_SEC are quiet."""
+        n = int(VOICE_ENDPOINT_SILENCE_SEC * VOICE_SAMPLE_RATE)
+        if not self.text() or len(self.audio) < n:
+            return False
+        last = self.audio[-n:]
+        return float(np.sqrt(np.mean(last * last))) < VOICE_SILENCE_RMS
+
+
+# content-addressed: same (normalized text, lang, engine) -> same file
+TTS_ENGINE = "gtts"
+TTS_MAX_CHARS = 1500
+_tts_locks: Dict[str, threading.Lock] = {}
+_tts_locks_guard = threading.Lock()
+
+
+def _tts_normalize(text: str) -> str:
+    text = unicodedata.normalize("NFC", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text[:TTS_MAX_CHARS]
+
+
+def tts_filename(text: str, lang: str = "hi", engine: str = TTS_ENGINE) -> str:
+    key = hashlib.sha256(f"{engine}|{lang}|{_tts_normalize(text)}".encode("utf-8")).hexdigest()
+    return f"garhwali_{key[:32]}.mp3"
+
+
+class TTSAudioStore:
+    """
+    Disk store for TTS mp3s under TTS_OUTPUT_DIR, sharded as <2 hex>/<file>
+    so no directory grows huge. The file mtime doubles as "last access"
+    (bumped on reuse and on every /tts download), which makes the LRU order
+    survive restarts. A janitor thread drops files past TTS_MAX_AGE_SEC and
+    then least-recently-used ones until the total fits TTS_MAX_BYTES.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, max_age: int, min_keep: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.min_keep = min_keep
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.bytes_stored = 0
+        self.files = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted_age = 0
+        self.evicted_size = 0
+        self.last_sweep: Optional[float] = None
+
+    def relpath(self, filename: str) -> str:
+        shard = hashlib.sha256(filename.encode("utf-8")).hexdigest()[:2]
+        return f"{shard}/{filename}"
+
+    def path(self, rel: str) -> Path:
+        return self.root / rel
+
+    def touch(self, rel: str) -> None:
+        try:
+            os.utime(self.path(rel), None)
+        except OSError:
+            pass
+
+    def lookup(self, filename: str) -> Optional[str]:
+        """rel path of an existing file (counted as a hit, access time bumped) or None."""
+        rel = self.relpath(filename)
+        exists = self.path(rel).exists()
+        with self._lock:
+            if exists:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not exists:
+            return None
+        self.touch(rel)
+        return rel
+
+    def contains_url(self, audio_url: str) -> bool:
+        rel = audio_url.split("/tts/", 1)[-1]
+        if not self.path(rel).exists():
+            return False
+        self.touch(rel)
+        return True
+
+    def added(self, rel: str) -> None:
+        try:
+            size = self.path(rel).stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            self.bytes_stored += size
+            self.files += 1
+            over = self.bytes_stored > self.max_bytes
+        if over:
+            self._wake.set()
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        # shard dirs plus legacy flat files in the root
+        for p in list(self.root.iterdir()) + list(self.root.glob("*/*")):
+            try:
+                if not p.is_file():
+                    continue
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def sweep(self) -> None:
+        now = time.time()
+        evicted_age = evicted_size = 0
+        kept: List[Tuple[float, int, Path]] = []
+        for mtime, size, p in self._scan():
+            stale_tmp = p.suffix == ".tmp" and now - mtime > self.min_keep
+            if stale_tmp or now - mtime > self.max_age:
+                if self._unlink(p):
+                    evicted_age += 0 if stale_tmp else 1
+                continue
+            kept.append((mtime, size, p))
+
+        total = sum(size for _m, size, _p in kept)
+        kept.sort()  # oldest access first
+        for mtime, size, p in kept:
+            if total <= self.max_bytes:
+                break
+            if now - mtime < self.min_keep:
+                break
+            if self._unlink(p):
+                total -= size
+                evicted_size += 1
+
+        with self._lock:
+            self.bytes_stored = total
+            self.files = len(kept) - evicted_size
+            self.evicted_age += evicted_age
+            self.evicted_size += evicted_size
+            self.last_sweep = now
+        if evicted_age or evicted_size:
+            print(f"✅ TTS janitor: evicted {evicted_age} old + {evicted_size} LRU files")
+
+    @staticmethod
+    def _unlink(p: Path) -> bool:
+        try:
+            p.unlink()
+            return True
+        except OSError:
+            return False
+
+    def janitor_loop(self) -> None:
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"⚠️ TTS janitor failed: {e}")
+            self._wake.wait(TTS_JANITOR_INTERVAL)
+            self._wake.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "bytes_stored": self.bytes_stored,
+                "max_bytes": self.max_bytes,
+                "files": self.files,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evicted_age": self.evicted_age,
+                "evicted_size": self.evicted_size,
+                "last_sweep": self.last_sweep,
+            }
 
-    filename = f"garhwali_{uuid.uuid4().hex}.mp3"
-    out_path = TTS_OUTPUT_DIR / filename
 
+tts_store = TTSAudioStore(TTS_OUTPUT_DIR, TTS_MAX_BYTES, TTS_MAX_AGE_SEC, TTS_MIN_KEEP_SEC)
+
+
+def tts_garhwali(text: str) -> str:
+    """
+    Returns the mp3 path relative to /tts; synthesizes only if that exact
+    audio is not in the store yet.
+    """
+    safe_text = _tts_normalize(text)
     # अभी Garhwali भी Hindi TTS से ही बोलेगा (hi-IN voice)
-    tts = gTTS(text=safe_text, lang="hi")
-    tts.save(str(out_path))
-    return filename
+    filename = tts_filename(safe_text, lang="hi")
+    rel = tts_store.lookup(filename)
+    if rel is not None:
+        return rel
+
+    rel = tts_store.relpath(filename)
+    out_path = tts_store.path(rel)
+    with _tts_locks_guard:
+        lock = _tts_locks.setdefault(filename, threading.Lock())
+    with lock:
+        if not out_path.exists():
+            out_path.parent.mkdir(exist_ok=True)
+            # write aside, then rename: /tts never serves a half-written file
+            tmp_path = out_path.with_name(f".{uuid.uuid4().hex}.tmp")
+            try:
+                gTTS(text=safe_text, lang="hi").save(str(tmp_path))
+                os.replace(tmp_path, out_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            tts_store.added(rel)
+    with _tts_locks_guard:
+        _tts_locks.pop(filename, None)
+    return rel
 
 # ================== DOCS RAG PIPELINE ==================
 
 
-def build_docs_system_prompt() -> str:
-    return (
+def build_docs_system_prompt(target_lang: Optional[str] = None) -> str:
+    prompt = (
         "आप 'Panchayat Sahayika' हैं, उत्तराखंड की ग्राम पंचायतों के लिए सहायक।\n"
         "यूज़र कभी-कभी गढ़वाली या हिंग्लिश में भी सवाल पूछ सकते हैं; "
         "आप अर्थ समझकर पहले सरल हिन्दी में जवाब तैयार करें (बाद में ज़रूरत हो तो दूसरी भाषा में अनुवाद होगा)।\n"
@@ -8202,43 +9452,237 @@ def build_docs_system_prompt() -> str:
         "और आप अंदाज़ा नहीं लगा रहे हैं।\n"
         "कभी भी दस्तावेज़ का नाम, फाइल का नाम, पेज नंबर या 'source' list का ज़िक्र न करें।\n"
     )
+    rules = _output_language_rules(target_lang)
+    if rules:
+        prompt += "\n" + rules + "\n"
+    return prompt
+
+
+def _docs_contexts_from_results(results) -> List[Dict[str, Any]]:
+    contexts = []
+    for r in results:
+        pl = r.payload or {}
+        ctx = {
+            "text": pl.get("text", ""),
+            "source_file": pl.get("source_file", ""),
+            "page": pl.get("page", ""),
+            "url": pl.get("url", ""),
+            "score": r.score,
+        }
+        # only present when searched with_vectors=True (used for dedupe)
+        if isinstance(getattr(r, "vector", None), list):
+            ctx["vector"] = r.vector
+        contexts.append(ctx)
+    return contexts
+
+
+def retrieve_docs_context_batch(
+    queries: List[str], top_k: int = 8
+) -> List[List[Dict[str, Any]]]:
+    """One result list per query, in order; uses Qdrant search_batch."""
+    if not queries:
+        return []
+    vecs = embed_doc_queries(queries)
+    qclient = get_doc_qclient()
+
+    out: List[List[Dict[str, Any]]] = []
+    for i in range(0, len(vecs), DOCS_SEARCH_BATCH_SIZE):
+        requests = [
+            qm.SearchRequest(vector=v.tolist(), limit=top_k, with_payload=True)
+            for v in vecs[i : i + DOCS_SEARCH_BATCH_SIZE]
+        ]
+        for results in qclient.search_batch(collection_name=DOC_COLLECTION, requests=requests):
+            out.append(_docs_contexts_from_results(results))
+    return out
+
 
+def retrieve_docs_context(query: str | List[str], top_k: int = 8):
+    """
+    str  -> List[context]            (single query, as before)
+    list -> List[List[context]]      (multi-query, batched)
+    """
+    if isinstance(query, list):
+        return retrieve_docs_context_batch(query, top_k=top_k)
 
-def retrieve_docs_context(query: str, top_k: int = 8) -> List[Dict[str, Any]]:
-    query_vec = list(doc_embedder.embed([query]))[0]
-    results = doc_qclient.search(
+    query_vec = embed_doc_query(query).tolist()
+    results = get_doc_qclient().search(
         collection_name=DOC_COLLECTION,
         query_vector=query_vec,
-        limit=top_k,
+        limit=max(top_k, DOCS_RERANK_FETCH) if DOCS_RERANK_ENABLED else top_k,
         with_payload=True,
+        with_vectors=True,
     )
+    contexts = _docs_contexts_from_results(results)
+    if DOCS_RERANK_ENABLED:
+        contexts = rerank_docs_contexts(query, contexts)
+    return contexts
 
-    contexts = []
-    for r in results:
-        pl = r.payload or {}
-        contexts.append(
-            {
-                "text": pl.get("text", ""),
-                "source_file": pl.get("source_file", ""),
-                "page": pl.get("page", ""),
-                "url": pl.get("url", ""),
-                "score": r.score,
-            }
-        )
+
+async def retrieve_docs_context_async(query: str, top_k: int = 8) -> List[Dict[str, Any]]:
+    query_vec = (await run_blocking(embed_doc_query, query)).tolist()
+    results = await get_async_doc_qclient().search(
+        collection_name=DOC_COLLECTION,
+        query_vector=query_vec,
+        limit=max(top_k, DOCS_RERANK_FETCH) if DOCS_RERANK_ENABLED else top_k,
+        with_payload=True,
+        with_vectors=True,
+    )
+    contexts = _docs_contexts_from_results(results)
+    if DOCS_RERANK_ENABLED:
+        contexts = await run_blocking(rerank_docs_contexts, query, contexts)
     return contexts
 
 
-def generate_docs_answer_raw(
+# ================== DOCS RERANK ==================
+
+
+def rerank_docs_contexts(
+    query: str,
+    contexts: List[Dict[str, Any]],
+    keep: int = DOCS_RERANK_KEEP,
+) -> List[Dict[str, Any]]:
+    """
+    Cross-encoder rerank of Qdrant candidates, scored in vector order in
+    small batches until DOCS_RERANK_BUDGET_MS is spent. Scored chunks below
+    DOCS_RERANK_MIN_SCORE are cut (the best one always survives); chunks
+    left unscored by the budget keep their vector order after the scored ones.
+    """
+    candidates = [c for c in contexts if c.get("text")]
+    if len(candidates) <= 1:
+        return candidates[:keep]
+
+    model = get_docs_reranker()
+    deadline = time.perf_counter() + DOCS_RERANK_BUDGET_MS / 1000.0
+    scored: List[Dict[str, Any]] = []
+    i = 0
+    while i < len(candidates):
+        batch = candidates[i : i + DOCS_RERANK_BATCH]
+        logits = model.predict(
+            [(query, c["text"]) for c in batch], batch_size=DOCS_RERANK_BATCH
+        )
+        probs = 1.0 / (1.0 + np.exp(-np.asarray(logits, dtype=np.float32)))
+        scored.extend({**c, "rerank_score": float(p)} for c, p in zip(batch, probs))
+        i += len(batch)
+        if time.perf_counter() > deadline:
+            break
+
+    scored.sort(key=lambda c: c["rerank_score"], reverse=True)
+    kept = [c for c in scored if c["rerank_score"] >= DOCS_RERANK_MIN_SCORE] or scored[:1]
+    # unscored tail ranks just at the cutoff so the packer keeps it behind the scored chunks
+    tail = [{**c, "rerank_score": DOCS_RERANK_MIN_SCORE} for c in candidates[i:]]
+    return (kept + tail)[:keep]
+
+
+# ================== DOCS CONTEXT PACKING ==================
+
+_DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+
+
+def approx_tokens(text: str) -> int:
+    """
+    Cheap token estimate for the Groq (Llama) tokenizer without loading it:
+    ~3 chars/token for Devanagari, ~4 chars/token for everything else.
+    """
+    if not text:
+        return 0
+    deva = len(_DEVANAGARI_RE.findall(text))
+    return int((deva / 3.0) + ((len(text) - deva) / 4.0)) + 1
+
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    tokens = approx_tokens(text)
+    if tokens <= budget:
+        return text
+    return text[: max(0, int(len(text) * budget / tokens))]
+
+
+def _near_duplicate(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    va, vb = a.get("vector"), b.get("vector")
+    if va is not None and vb is not None:
+        va, vb = np.asarray(va, dtype=np.float32), np.asarray(vb, dtype=np.float32)
+        denom = float(np.linalg.norm(va) * np.linalg.norm(vb)) or 1.0
+        return float(va @ vb) / denom >= DOCS_DEDUPE_SIM
+    # no vectors: token-set overlap
+    ta, tb = set(a["text"].split()), set(b["text"].split())
+    if not ta or not tb:
+        return False
+    return len(ta & tb) / len(ta | tb) >= DOCS_DEDUPE_SIM
+
+
+def _docs_relevance(c: Dict[str, Any]) -> float:
+    # cross-encoder probability when reranked, else vector similarity
+    return c.get("rerank_score", c.get("score")) or 0.0
+
+
+def pack_docs_contexts(
+    contexts: List[Dict[str, Any]], budget: int = DOCS_CONTEXT_TOKEN_BUDGET
+) -> List[Dict[str, Any]]:
+    """
+    Keep the prompt's document block within `budget` tokens:
+    drop near-duplicate chunks (embedding cosine, else word overlap), then
+    pick greedily by relevance-per-token. The best chunk always goes in
+    (truncated if it alone is over budget). Output keeps relevance order.
+    """
+    ranked = sorted(
+        (c for c in contexts if c.get("text")),
+        key=_docs_relevance,
+        reverse=True,
+    )
+    unique: List[Dict[str, Any]] = []
+    for c in ranked:
+        if not any(_near_duplicate(c, u) for u in unique):
+            unique.append(c)
+    if not unique:
+        return []
+
+    costs = [approx_tokens(c["text"]) for c in unique]
+    chosen = {0}
+    used = costs[0]
+    by_density = sorted(
+        range(1, len(unique)),
+        key=lambda i: _docs_relevance(unique[i]) / costs[i],
+        reverse=True,
+    )
+    for i in by_density:
+        if used + costs[i] <= budget:
+            chosen.add(i)
+            used += costs[i]
+
+    packed = [unique[i] for i in sorted(chosen)]
+    if costs[0] > budget:
+        packed[0] = {**packed[0], "text": _truncate_to_tokens(packed[0]["text"], budget)}
+    return packed
+
+
+def _history_within_budget(
+    history: List[Dict[str, str]], budget: int = DOCS_HISTORY_TOKEN_BUDGET
+) -> List[Dict[str, str]]:
+    """Most recent turns first until the budget runs out; the newest is truncated if needed."""
+    kept: List[Dict[str, str]] = []
+    used = 0
+    for h in reversed(history):
+        cost = approx_tokens(h["content"])
+        if used + cost > budget:
+            if not kept:
+                kept.append({**h, "content": _truncate_to_tokens(h["content"], budget)})
+            break
+        kept.append(h)
+        used += cost
+    return list(reversed(kept))
+
+
+def _build_docs_messages(
     query: str,
     history: List[Dict[str, str]],
-    user_meta: Dict[str, Any] | None = None,
-) -> Tuple[str, List[Dict[str, Any]]]:
-    contexts = retrieve_docs_context(query)
+    user_meta: Dict[str, Any] | None,
+    contexts: List[Dict[str, Any]],
+    target_lang: Optional[str] = None,
+) -> List[Dict[str, str]]:
     context_block = "\n\n---\n\n".join(c["text"] for c in contexts if c["text"])
 
     user_ctx = build_user_context(user_meta)
 
-    system_prompt = build_docs_system_prompt()
+    system_prompt = build_docs_system_prompt(target_lang)
     if user_ctx:
         system_prompt += (
             "\n\nउपयोगकर्ता प्रोफाइल (उदाहरणों को practical banane ke liye):\n"
@@ -8249,7 +9693,7 @@ def generate_docs_answer_raw(
 
     messages = [{"role": "system", "content": system_prompt}]
 
-    for h in history[-4:] if history else []:
+    for h in _history_within_budget(history[-4:]) if history else []:
         messages.append({"role": h["role"], "content": h["content"]})
 
     messages.append(
@@ -8263,15 +9707,10 @@ def generate_docs_answer_raw(
             ),
         }
     )
+    return messages
 
-    completion = groq_client.chat.completions.create(
-        model=GROQ_MODEL_DOCS,
-        messages=messages,
-        temperature=0.3,
-        max_tokens=900,
-    )
-    raw_answer = completion.choices[0].message.content or ""
 
+def _docs_unique_sources(contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     unique_sources = []
     seen = set()
     for c in contexts:
@@ -8285,8 +9724,29 @@ def generate_docs_answer_raw(
                     "url": c["url"],
                 }
             )
+    return unique_sources
 
-    return raw_answer, unique_sources
+
+async def generate_docs_answer_raw_async(
+    query: str,
+    history: List[Dict[str, str]],
+    user_meta: Dict[str, Any] | None = None,
+    contexts: Optional[List[Dict[str, Any]]] = None,
+    target_lang: Optional[str] = None,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    if contexts is None:
+        contexts = pack_docs_contexts(await retrieve_docs_context_async(query))
+    messages = _build_docs_messages(query, history, user_meta, contexts, target_lang)
+
+    completion = await get_async_groq_client().chat.completions.create(
+        model=GROQ_MODEL_DOCS,
+        messages=messages,
+        temperature=0.3,
+        max_tokens=900,
+    )
+    raw_answer = completion.choices[0].message.content or ""
+
+    return raw_answer, _docs_unique_sources(contexts)
 
 # ================== SCHEMES PIPELINE ==================
 
@@ -8307,7 +9767,38 @@ def load_schemes() -> List[Dict[str, Any]]:
         s.setdefault("apply_link", "")
         s.setdefault("source_url", "")
         s.setdefault("type", s.get("type", "scheme"))
-    return data
+    return _canonical_schemes(data)
+
+
+def _scheme_dedupe_key(s: Dict[str, Any]) -> str:
+    return _norm(s.get("name_hi") or s.get("name_en") or "")
+
+
+def _canonical_schemes(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    One canonical entry per scheme name. Later duplicates only fill fields
+    that the first entry left empty; their differing names become aliases.
+    """
+    canonical: Dict[str, Dict[str, Any]] = {}
+    out: List[Dict[str, Any]] = []
+    for s in data:
+        key = _scheme_dedupe_key(s)
+        if not key:
+            out.append(s)
+            continue
+        first = canonical.get(key)
+        if first is None:
+            canonical[key] = s
+            out.append(s)
+            continue
+        for field, value in s.items():
+            if value and not first.get(field):
+                first[field] = value
+        aliases = first.setdefault("aliases", [])
+        for name in (s.get("name_hi"), s.get("name_en")):
+            if name and name not in (first.get("name_hi"), first.get("name_en")) and name not in aliases:
+                aliases.append(name)
+    return out
 
 
 def _concat_item_text(s: Dict[str, Any]) -> str:
@@ -8326,29 +9817,168 @@ def _concat_item_text(s: Dict[str, Any]) -> str:
     return " | ".join([p for p in [weighted_name, rest] if p])
 
 
-def init_schemes_collection():
-    schemes = load_schemes()
+# Bump when _concat_item_text changes, so every scheme is re-embedded once.
+SCHEMES_INDEX_VERSION = "1"
+
+SCHEMES_EMBED_BATCH_SIZE = int(os.getenv("SCHEMES_EMBED_BATCH_SIZE", "64"))
+SCHEMES_UPSERT_BATCH_SIZE = int(os.getenv("SCHEMES_UPSERT_BATCH_SIZE", "512"))
+
+
+def _scheme_content_hash(s: Dict[str, Any]) -> str:
+    blob = json.dumps(s, ensure_ascii=False, sort_keys=True)
+    key = f"{EMBED_MODEL_NAME_SCHEMES}|{SCHEMES_INDEX_VERSION}|{blob}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _scheme_point_id(content_hash: str) -> str:
+    # stable across restarts: same scheme content -> same point id
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"scheme:{content_hash}"))
 
-    scheme_qdrant.recreate_collection(
-        collection_name=SCHEMES_COLLECTION,
-        vectors_config=VectorParams(
-            size=scheme_embed_model.get_sentence_embedding_dimension(),
-            distance=Distance.COSINE,
-        ),
-    )
 
-    points: List[PointStruct] = []
+# ((mtime_ns, size) of SCHEMES_PATH, fingerprint): re-hashed when the file changes
+_schemes_fingerprint: Tuple[Optional[Tuple[int, int]], str] = (None, "")
+
+
+def schemes_index_fingerprint() -> str:
+    """Changes whenever any scheme is added, removed or edited."""
+    global _schemes_fingerprint
+    st = SCHEMES_PATH.stat()
+    file_key = (st.st_mtime_ns, st.st_size)
+    if _schemes_fingerprint[0] != file_key:
+        _schemes_fingerprint = (
+            file_key,
+            _fingerprint_of([_scheme_content_hash(s) for s in load_schemes()]),
+        )
+    return _schemes_fingerprint[1]
+
+
+# registry entries built from the catalog; dropped together when it changes
+_SCHEME_INDEX_MODELS = (
+    "schemes_index",
+    "scheme_memory_index",
+    "scheme_lexical_index",
+    "scheme_bm25_index",
+    "scheme_name_index",
+)
+_indexed_fingerprint: Optional[str] = None
+_indexed_fingerprint_lock = threading.Lock()
+
+
+def scheme_indexes_fingerprint() -> str:
+    """
+    Fingerprint of the catalog the scheme indexes serve. If schemes.json
+    changed since they were built they are evicted from the registry and
+    reload lazily (Qdrant re-sync / new snapshot) on next use.
+    """
+    global _indexed_fingerprint
+    current = schemes_index_fingerprint()
+    if current != _indexed_fingerprint:
+        with _indexed_fingerprint_lock:
+            if _indexed_fingerprint is not None and current != _indexed_fingerprint:
+                for name in _SCHEME_INDEX_MODELS:
+                    _MODELS.pop(name, None)
+                with _scheme_cursor_lock:
+                    _scheme_cursor_cache.clear()
+                print("⚠️ Schemes catalog changed, reloading scheme indexes")
+            _indexed_fingerprint = current
+    return current
+
+
+def _scheme_payload(s: Dict[str, Any], text: str, content_hash: str) -> Dict[str, Any]:
+    payload = dict(s)
+    payload["__search_blob"] = text
+    payload["__content_hash"] = content_hash
+    return payload
+
+
+def _existing_scheme_point_ids(scheme_qdrant: QdrantClient) -> set:
+    ids = set()
+    offset = None
+    while True:
+        points, offset = scheme_qdrant.scroll(
+            collection_name=SCHEMES_COLLECTION,
+            limit=256,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False,
+        )
+        ids.update(str(p.id) for p in points)
+        if offset is None:
+            break
+    return ids
+
+
+def init_schemes_collection(scheme_qdrant: Optional[QdrantClient] = None):
+    """
+    Incremental, content-hashed indexing: only new / changed schemes are
+    embedded, unchanged points already in qdrant_data are left alone and
+    points for removed schemes are deleted.
+    """
+    schemes = load_schemes()
+    if scheme_qdrant is None:
+        scheme_qdrant = get_scheme_qdrant()
+
+    wanted: Dict[str, Dict[str, Any]] = {}
     for s in schemes:
-        vec = scheme_embed_model.encode(_concat_item_text(s)).tolist()
-        payload = dict(s)
-        payload["__search_blob"] = _concat_item_text(s)
-        points.append(PointStruct(id=str(uuid.uuid4()), vector=vec, payload=payload))
+        content_hash = _scheme_content_hash(s)
+        wanted[_scheme_point_id(content_hash)] = {"scheme": s, "hash": content_hash}
+
+    if scheme_qdrant.collection_exists(SCHEMES_COLLECTION):
+        existing = _existing_scheme_point_ids(scheme_qdrant)
+    else:
+        existing = set()
+
+    to_add = [pid for pid in wanted if pid not in existing]
+    stale = [pid for pid in existing if pid not in wanted]
 
-    scheme_qdrant.upsert(SCHEMES_COLLECTION, points)
-    print(f"✅ Indexed {len(points)} schemes into Qdrant (schemes collection)")
+    if stale:
+        scheme_qdrant.delete(
+            collection_name=SCHEMES_COLLECTION,
+            points_selector=qm.PointIdsList(points=stale),
+        )
+
+    if not to_add:
+        print(
+            f"✅ Schemes index up to date ({len(wanted)} schemes, "
+            f"{len(stale)} stale removed)"
+        )
+        return
 
+    # embedder is only loaded when something actually needs embedding
+    scheme_embed_model = get_scheme_embed_model()
 
-init_schemes_collection()
+    if not scheme_qdrant.collection_exists(SCHEMES_COLLECTION):
+        scheme_qdrant.create_collection(
+            collection_name=SCHEMES_COLLECTION,
+            vectors_config=VectorParams(
+                size=scheme_embed_model.get_sentence_embedding_dimension(),
+                distance=Distance.COSINE,
+            ),
+        )
+
+    indexed = 0
+    for i in range(0, len(to_add), SCHEMES_UPSERT_BATCH_SIZE):
+        chunk = to_add[i : i + SCHEMES_UPSERT_BATCH_SIZE]
+        # build the search text once per scheme; it is both embedded and stored
+        texts = [_concat_item_text(wanted[pid]["scheme"]) for pid in chunk]
+        vecs = scheme_embed_model.encode(
+            texts,
+            batch_size=SCHEMES_EMBED_BATCH_SIZE,
+            show_progress_bar=False,
+        )
+
+        points: List[PointStruct] = []
+        for pid, text, vec in zip(chunk, texts, vecs):
+            payload = _scheme_payload(wanted[pid]["scheme"], text, wanted[pid]["hash"])
+            points.append(PointStruct(id=pid, vector=vec.tolist(), payload=payload))
+
+        scheme_qdrant.upsert(SCHEMES_COLLECTION, points)
+        indexed += len(points)
+
+    print(
+        f"✅ Indexed {indexed} new/changed schemes into Qdrant "
+        f"({len(wanted)} total, {len(stale)} stale removed)"
+    )
 
 
 def _norm(s: str) -> str:
@@ -8376,6 +10006,301 @@ def _qdrant_filter(
     return Filter(must=conds)
 
 
+# ================== IN-MEMORY SCHEMES ENGINE ==================
+
+
+class SchemeFieldMasks:
+    """
+    Boolean row masks for the category / department / type filters, with
+    the same semantics as the Qdrant MatchText filter (substring match).
+    One mask per distinct field value is built up front.
+    """
+
+    FILTER_FIELDS = ("category", "department", "type")
+
+    def __init__(self, payloads: List[Dict[str, Any]]):
+        self.size = len(payloads)
+        self._value_masks: Dict[str, Dict[str, np.ndarray]] = {}
+        for field in self.FILTER_FIELDS:
+            by_value: Dict[str, np.ndarray] = {}
+            for i, p in enumerate(payloads):
+                value = _norm(str(p.get(field) or ""))
+                if value not in by_value:
+                    by_value[value] = np.zeros(self.size, dtype=bool)
+                by_value[value][i] = True
+            self._value_masks[field] = by_value
+
+        self._mask_cache: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def _field_mask(self, field: str, text: str) -> np.ndarray:
+        key = (field, _norm(text))
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = np.zeros(self.size, dtype=bool)
+            for value, value_mask in self._value_masks[field].items():
+                if key[1] in value:
+                    mask |= value_mask
+            self._mask_cache[key] = mask
+        return mask
+
+    def mask(
+        self,
+        category: Optional[str],
+        department: Optional[str],
+        typ: Optional[str],
+    ) -> Optional[np.ndarray]:
+        """None means no filter."""
+        mask = None
+        for field, text in (("category", category), ("department", department), ("type", typ)):
+            if text:
+                m = self._field_mask(field, text)
+                mask = m if mask is None else (mask & m)
+        return mask
+
+
+class InMemorySchemeIndex:
+    """
+    Read-only scheme vectors as one contiguous float32 matrix (rows are
+    L2-normalised) plus a parallel payload list. Top-k cosine is a single
+    matrix-vector product; filters are boolean masks.
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        matrix: np.ndarray,
+        payloads: List[Dict[str, Any]],
+    ):
+        self.ids = list(ids)
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.payloads = payloads
+        self.masks = SchemeFieldMasks(payloads)
+        self._row_by_hash = {p.get("__content_hash", ""): i for i, p in enumerate(payloads)}
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def search(
+        self,
+        query_vector,
+        limit: int,
+        category: Optional[str] = None,
+        department: Optional[str] = None,
+        typ: Optional[str] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        if not self.payloads:
+            return []
+
+        q = np.asarray(query_vector, dtype=np.float32)
+        q_norm = float(np.linalg.norm(q))
+        if q_norm:
+            q = q / q_norm
+        scores = self.matrix @ q
+
+        mask = self.masks.mask(category, department, typ)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (float(scores[i]), self.payloads[i]) for i in top if np.isfinite(scores[i])
+        ]
+
+    def cosines(self, q: np.ndarray, content_hashes: List[str]) -> List[float]:
+        """Cosine of a normalised query against specific schemes (0.0 if unknown)."""
+        rows = [self._row_by_hash.get(h) for h in content_hashes]
+        return [float(self.matrix[r] @ q) if r is not None else 0.0 for r in rows]
+
+
+def _fingerprint_of(content_hashes: List[str]) -> str:
+    return hashlib.sha256("|".join(sorted(content_hashes)).encode("utf-8")).hexdigest()
+
+
+def _snapshot_version_dir(fingerprint: str) -> Path:
+    # one directory per catalog version: vectors.npy + meta.json always travel together
+    return SCHEMES_SNAPSHOT_DIR / f"v-{fingerprint[:16]}"
+
+
+def _export_schemes_snapshot(scheme_qdrant: QdrantClient) -> Path:
+    ids: List[str] = []
+    vectors: List[List[float]] = []
+    payloads: List[Dict[str, Any]] = []
+
+    offset = None
+    while True:
+        points, offset = scheme_qdrant.scroll(
+            collection_name=SCHEMES_COLLECTION,
+            limit=256,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        for p in points:
+            ids.append(str(p.id))
+            vectors.append(p.vector)
+            payloads.append(p.payload or {})
+        if offset is None:
+            break
+
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix = matrix / norms
+
+    final_dir = _snapshot_version_dir(
+        _fingerprint_of([p.get("__content_hash", "") for p in payloads])
+    )
+    # build the pair in a private temp dir, then publish it with a single rename
+    tmp_dir = SCHEMES_SNAPSHOT_DIR / f".tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    tmp_dir.mkdir(parents=True)
+    try:
+        np.save(tmp_dir / "vectors.npy", matrix)
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({"ids": ids, "payloads": payloads}, f, ensure_ascii=False)
+        try:
+            os.rename(tmp_dir, final_dir)
+        except OSError:
+            if not (final_dir / "meta.json").exists():
+                raise
+            # same version already published by someone else: theirs is identical
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    print(f"✅ Exported {len(ids)} scheme vectors to {final_dir}")
+    return final_dir
+
+
+def _prune_schemes_snapshots(keep: Path) -> None:
+    """Drop older snapshot versions (and the pre-versioning flat files)."""
+    for entry in SCHEMES_SNAPSHOT_DIR.iterdir():
+        if entry.is_dir() and entry.name.startswith("v-") and entry != keep:
+            shutil.rmtree(entry, ignore_errors=True)
+        elif entry.name in ("vectors.npy", "meta.json"):
+            entry.unlink(missing_ok=True)
+
+
+def _read_schemes_snapshot() -> Optional[InMemorySchemeIndex]:
+    snap_dir = _snapshot_version_dir(schemes_index_fingerprint())
+    meta_path = snap_dir / "meta.json"
+    vec_path = snap_dir / "vectors.npy"
+    if not meta_path.exists() or not vec_path.exists():
+        return None
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    # mmap: the OS shares these pages between all worker processes
+    matrix = np.load(vec_path, mmap_mode="r")
+    return InMemorySchemeIndex(meta["ids"], matrix, meta["payloads"])
+
+
+@contextmanager
+def _schemes_build_lock():
+    """Cross-process lock so only one worker (or the offline build) syncs qdrant_data."""
+    SCHEMES_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        import fcntl
+    except ImportError:  # non-POSIX: fall back to no locking
+        yield
+        return
+    with open(SCHEMES_SNAPSHOT_DIR / ".build.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def build_schemes_snapshot() -> Path:
+    """
+    Sync Qdrant with schemes.json and export the memory-engine snapshot.
+    Uses its own short-lived client so the qdrant_data lock is released as
+    soon as the export is done. Run offline via build_schemes_snapshot.py.
+    """
+    scheme_qdrant = QdrantClient(path=str(BASE_DIR / "qdrant_data"))
+    try:
+        init_schemes_collection(scheme_qdrant)
+        snap_dir = _export_schemes_snapshot(scheme_qdrant)
+    finally:
+        scheme_qdrant.close()
+    _prune_schemes_snapshots(keep=snap_dir)
+    return snap_dir
+
+
+def load_scheme_memory_index() -> InMemorySchemeIndex:
+    index = _read_schemes_snapshot()
+    if index is None:
+        # snapshot missing or stale -> one worker builds it, the rest wait and re-check
+        with _schemes_build_lock():
+            index = _read_schemes_snapshot()
+            if index is None:
+                build_schemes_snapshot()
+                index = _read_schemes_snapshot()
+    if index is None:
+        raise RuntimeError(f"schemes snapshot could not be built in {SCHEMES_SNAPSHOT_DIR}")
+    print(f"✅ In-memory schemes engine ready ({len(index)} vectors)")
+    return index
+
+
+def _scheme_vector_search(
+    qvec: List[float],
+    limit: int,
+    category: Optional[str],
+    department: Optional[str],
+    typ: Optional[str],
+) -> List[Tuple[float, Dict[str, Any]]]:
+    if SCHEMES_VECTOR_ENGINE == "memory":
+        return get_scheme_memory_index().search(
+            qvec, limit, category=category, department=department, typ=typ
+        )
+
+    ensure_schemes_index()
+    hits = get_scheme_qdrant().search(
+        collection_name=SCHEMES_COLLECTION,
+        query_vector=qvec,
+        limit=limit,
+        with_payload=True,
+        with_vectors=False,
+        query_filter=_qdrant_filter(category, department, typ),
+    )
+    return [(float(h.score) if hasattr(h, "score") else 0.0, h.payload) for h in hits]
+
+
+def _scheme_cosines(qvec: List[float], payloads: List[Dict[str, Any]]) -> List[float]:
+    """
+    Real query cosine for schemes that did not come out of vector search
+    (name / lexical hits), so their _score means the same as a dense hit's.
+    """
+    if not payloads:
+        return []
+    q = np.asarray(qvec, dtype=np.float32)
+    q = q / (float(np.linalg.norm(q)) or 1.0)
+    hashes = [p.get("__content_hash", "") for p in payloads]
+
+    if SCHEMES_VECTOR_ENGINE == "memory":
+        return get_scheme_memory_index().cosines(q, hashes)
+
+    ensure_schemes_index()
+    ids = [_scheme_point_id(h) for h in hashes]
+    points = get_scheme_qdrant().retrieve(
+        collection_name=SCHEMES_COLLECTION,
+        ids=ids,
+        with_payload=False,
+        with_vectors=True,
+    )
+    vectors = {str(pt.id): pt.vector for pt in points}
+    out = []
+    for pid in ids:
+        v = vectors.get(pid)
+        if v is None:
+            out.append(0.0)
+            continue
+        v = np.asarray(v, dtype=np.float32)
+        out.append(float(v @ q) / (float(np.linalg.norm(v)) or 1.0))
+    return out
+
+
 def _keyword_boost(question: str, item: Dict[str, Any]) -> float:
     q = _norm(question)
     name = _norm((item.get("name_hi", "") + " " + item.get("name_en", "")))
@@ -8391,7 +10316,481 @@ def _keyword_boost(question: str, item: Dict[str, Any]) -> float:
         if w in name or w in cat or w in dept:
             boost += 0.15
 
-    return boost
+    return boost
+
+
+class SchemeLexicalIndex:
+    """
+    Pre-normalised name / category / department text for every scheme plus
+    an inverted token index, so the keyword boost for all candidates of a
+    query is computed in one pass without normalising any field again.
+
+    Matches _keyword_boost exactly: a query word (no spaces) is a substring
+    of a field iff it is a substring of one of the field's tokens.
+    """
+
+    WORD_CACHE_SIZE = 20000
+
+    def __init__(self, schemes: List[Dict[str, Any]]):
+        self.names: List[str] = []
+        self.row_of: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+
+        for row, s in enumerate(schemes):
+            self.row_of[_scheme_content_hash(s)] = row
+            name = _norm(s.get("name_hi", "") + " " + s.get("name_en", ""))
+            self.names.append(name)
+            fields = " ".join(
+                [name, _norm(s.get("category", "")), _norm(s.get("department", ""))]
+            )
+            for tok in set(fields.split()):
+                postings.setdefault(tok, []).append(row)
+
+        self.size = len(self.names)
+        self._postings = {tok: np.asarray(rows, dtype=np.int64) for tok, rows in postings.items()}
+        self._word_masks: Dict[str, np.ndarray] = {}
+
+    def _word_mask(self, word: str) -> np.ndarray:
+        mask = self._word_masks.get(word)
+        if mask is None:
+            mask = np.zeros(self.size, dtype=bool)
+            for tok, rows in self._postings.items():
+                if word in tok:
+                    mask[rows] = True
+            if len(self._word_masks) >= self.WORD_CACHE_SIZE:
+                self._word_masks.clear()
+            self._word_masks[word] = mask
+        return mask
+
+    def boost_all(self, question: str) -> Tuple[str, np.ndarray]:
+        """Word-level boost for every scheme in the catalog."""
+        q = _norm(question)
+        boosts = np.zeros(self.size, dtype=np.float32)
+        for w in q.split():
+            if len(w) > 2:
+                boosts += 0.15 * self._word_mask(w)
+        return q, boosts
+
+    def boosts(self, question: str, content_hashes: List[str]) -> List[Optional[float]]:
+        """Boost per candidate; None for candidates unknown to the index."""
+        q, word_boosts = self.boost_all(question)
+        out: List[Optional[float]] = []
+        for h in content_hashes:
+            row = self.row_of.get(h)
+            if row is None:
+                out.append(None)
+                continue
+            boost = float(word_boosts[row])
+            if q and q in self.names[row]:
+                boost += 0.6
+            out.append(boost)
+        return out
+
+
+# ---- BM25 (Hindi / English / Hinglish) ----
+
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0963\u0966-\u097F]+")
+
+_DEVANAGARI_CONSONANTS = {
+    "क": "k", "ख": "k", "ग": "g", "घ": "g", "ङ": "n",
+    "च": "c", "छ": "c", "ज": "j", "झ": "j", "ञ": "n",
+    "ट": "t", "ठ": "t", "ड": "d", "ढ": "d", "ण": "n",
+    "त": "t", "थ": "t", "द": "d", "ध": "d", "न": "n",
+    "प": "p", "फ": "p", "ब": "b", "भ": "b", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "व": "v",
+    "श": "s", "ष": "s", "स": "s",
+    "ं": "n", "ँ": "n", "ृ": "r", "ऋ": "r",
+}
+
+_ROMAN_DIGRAPHS = [
+    ("chh", "c"), ("sh", "s"), ("ch", "c"), ("kh", "k"), ("gh", "g"),
+    ("th", "t"), ("dh", "d"), ("ph", "p"), ("bh", "b"), ("jh", "j"),
+    ("w", "v"), ("f", "p"), ("z", "j"), ("q", "k"), ("x", "ks"),
+]
+
+
+def _phonetic_key(token: str) -> str:
+    """
+    Consonant skeleton shared by Devanagari and Roman spellings, so that
+    Hinglish matches Hindi: "awas" / "आवास" -> "avs",
+    "vidhwa pension" / "विधवा पेंशन" -> "vdv pnsn".
+    """
+    if not token:
+        return ""
+
+    if "\u0900" <= token[0] <= "\u097F":
+        out = ["a"] if "\u0904" <= token[0] <= "\u0914" else []
+        out.extend(_DEVANAGARI_CONSONANTS.get(ch, "") for ch in token)
+    else:
+        t = token.lower()
+        for src, dst in _ROMAN_DIGRAPHS:
+            t = t.replace(src, dst)
+        out = ["a"] if t[0] in "aeiou" else []
+        out.extend(ch for ch in t if ch.isalpha() and ch not in "aeiouh")
+
+    key = []
+    for ch in "".join(out):
+        if not key or key[-1] != ch:
+            key.append(ch)
+    return "".join(key)
+
+
+def _bm25_tokens(text: str) -> List[str]:
+    tokens: List[str] = []
+    for tok in _TOKEN_RE.findall(_norm(text)):
+        tokens.append(tok)
+        key = _phonetic_key(tok)
+        if len(key) >= 2:
+            tokens.append("~" + key)
+    return tokens
+
+
+class SchemeBM25Index:
+    """
+    Okapi BM25 over scheme names (weighted x3), category, department,
+    descriptions, eligibility, benefit and apply process. Every token is
+    indexed twice: as written and as a phonetic key (see _phonetic_key).
+    Each term keeps a sparse posting list (doc ids + precomputed BM25
+    contribution), so memory grows with the number of postings, not
+    vocabulary x schemes, and a query scatter-adds a few short arrays.
+    """
+
+    K1 = 1.5
+    B = 0.75
+    NAME_WEIGHT = 3
+
+    def __init__(self, schemes: List[Dict[str, Any]]):
+        self.payloads: List[Dict[str, Any]] = []
+        self.name_tokens: List[set] = []
+        doc_tfs: List[Dict[str, int]] = []
+
+        for s in schemes:
+            text = _concat_item_text(s)
+            self.payloads.append(_scheme_payload(s, text, _scheme_content_hash(s)))
+
+            name_toks = _bm25_tokens(s.get("name_hi", "") + " " + s.get("name_en", ""))
+            self.name_tokens.append(set(name_toks))
+            other = " ".join(
+                str(s.get(f, ""))
+                for f in (
+                    "category",
+                    "department",
+                    "description_hi",
+                    "description_en",
+                    "eligibility",
+                    "benefit",
+                    "apply_process",
+                )
+            )
+            tf: Dict[str, int] = {}
+            for tok in name_toks * self.NAME_WEIGHT + _bm25_tokens(other):
+                tf[tok] = tf.get(tok, 0) + 1
+            doc_tfs.append(tf)
+
+        n = len(doc_tfs)
+        self.size = n
+        self.masks = SchemeFieldMasks(self.payloads)
+
+        doc_len = np.asarray([sum(tf.values()) for tf in doc_tfs], dtype=np.float32)
+        avgdl = float(doc_len.mean()) if n else 1.0
+        norm = self.K1 * (1 - self.B + self.B * doc_len / max(avgdl, 1e-6))
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for doc_id, tf in enumerate(doc_tfs):
+            for tok, count in tf.items():
+                ids, counts = postings.setdefault(tok, ([], []))
+                ids.append(doc_id)
+                counts.append(count)
+
+        # term -> (doc ids, BM25 contribution per doc)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for tok, (ids, counts) in postings.items():
+            doc_ids = np.asarray(ids, dtype=np.int32)
+            tf_vec = np.asarray(counts, dtype=np.float32)
+            idf = np.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            self._postings[tok] = (
+                doc_ids,
+                (idf * tf_vec * (self.K1 + 1) / (tf_vec + norm[doc_ids])).astype(np.float32),
+            )
+
+    def search(
+        self,
+        question: str,
+        limit: int,
+        category: Optional[str] = None,
+        department: Optional[str] = None,
+        typ: Optional[str] = None,
+    ) -> Tuple[List[Tuple[float, Dict[str, Any]]], bool]:
+        """
+        Returns ([(bm25, payload), ...] best first, confident). `confident`
+        means every query token (or its phonetic key) occurs in the top
+        scheme's name and that scheme clearly beats the runner-up, i.e.
+        the user typed a scheme name and the dense pass can be skipped.
+        """
+        q_tokens = _TOKEN_RE.findall(_norm(question))
+        if not q_tokens or not self.size:
+            return [], False
+
+        scores = np.zeros(self.size, dtype=np.float32)
+        for tok in _bm25_tokens(question):
+            posting = self._postings.get(tok)
+            if posting is not None:
+                doc_ids, contrib = posting
+                scores[doc_ids] += contrib  # ids are unique within a posting list
+
+        mask = self.masks.mask(category, department, typ)
+        if mask is not None:
+            scores = np.where(mask, scores, 0.0)
+
+        k = min(limit, self.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        hits = [(float(scores[i]), self.payloads[i]) for i in top if scores[i] > 0]
+        if not hits:
+            return [], False
+
+        best_names = self.name_tokens[int(top[0])]
+        covered = all(
+            tok in best_names or ("~" + _phonetic_key(tok)) in best_names
+            for tok in q_tokens
+        )
+        runner_up = hits[1][0] if len(hits) > 1 else 0.0
+        confident = covered and hits[0][0] >= 1.5 * runner_up
+        return hits, confident
+
+
+# ---- Scheme-name fast path ----
+
+# words that do not identify a scheme ("योजना", "yojna", "scheme", ...)
+_GENERIC_NAME_KEYS = {"yjn", "scm", "skm"}
+
+
+def _name_key(text: str) -> str:
+    """Phonetic key of a name with generic words dropped, e.g. 'atl avs'."""
+    keys = []
+    for tok in _TOKEN_RE.findall(_norm(text)):
+        key = _phonetic_key(tok) or tok
+        if key not in _GENERIC_NAME_KEYS:
+            keys.append(key)
+    return " ".join(keys)
+
+
+def _deletes1(key: str) -> List[str]:
+    return [key[:i] + key[i + 1 :] for i in range(len(key))]
+
+
+class SchemeNameIndex:
+    """
+    Alias dictionary over Hindi / English scheme names, the names without
+    their bracketed part, and bracketed acronyms (PM-AJAY, RKVY, ...).
+    Aliases are stored as phonetic keys, which already absorbs
+    transliteration and vowel misspellings ("yojna", "vidwa"). One further
+    consonant typo is caught by a SymSpell-style deletion index, but only for
+    long keys: short vowel-stripped keys are one edit apart from unrelated
+    schemes ("pm ksn" vs "pm ksm" = PM-KUSUM). The whole query must be the
+    name. Aliases shared by several schemes are dropped as ambiguous.
+    """
+
+    MIN_FUZZY_LEN = 10
+    MAX_QUERY_TOKENS = 12
+
+    def __init__(self, schemes: List[Dict[str, Any]]):
+        exact: Dict[str, set] = {}
+        fuzzy: Dict[str, set] = {}
+        self.payloads: List[Dict[str, Any]] = []
+
+        for row, s in enumerate(schemes):
+            self.payloads.append(
+                _scheme_payload(s, _concat_item_text(s), _scheme_content_hash(s))
+            )
+            for alias in self._aliases(s):
+                key = _name_key(alias)
+                if not key:
+                    continue
+                exact.setdefault(key, set()).add(row)
+                if len(key) >= self.MIN_FUZZY_LEN:
+                    for d in _deletes1(key):
+                        fuzzy.setdefault(d, set()).add(row)
+
+        self._exact = {k: next(iter(v)) for k, v in exact.items() if len(v) == 1}
+        self._fuzzy = {k: next(iter(v)) for k, v in fuzzy.items() if len(v) == 1}
+
+    @staticmethod
+    def _aliases(s: Dict[str, Any]) -> List[str]:
+        aliases = []
+        for name in [s.get("name_hi", ""), s.get("name_en", "")] + list(s.get("aliases") or []):
+            if not name:
+                continue
+            aliases.append(name)
+            base = re.sub(r"\([^)]*\)", " ", name)
+            if base.strip() != name.strip():
+                aliases.append(base)
+            for inner in re.findall(r"\(([^)]*)\)", name):
+                if re.fullmatch(r"[A-Za-z][A-Za-z\s\-\.]{1,20}", inner.strip()):
+                    aliases.append(inner)
+        return aliases
+
+    def lookup(self, question: str) -> Optional[Dict[str, Any]]:
+        if len(question.split()) > self.MAX_QUERY_TOKENS:
+            return None
+        key = _name_key(question)
+        if not key:
+            return None
+
+        row = self._exact.get(key)
+        if row is None and len(key) >= self.MIN_FUZZY_LEN:
+            # one extra / missing / wrong consonant on either side
+            row = self._fuzzy.get(key)
+            if row is None:
+                candidates = {self._exact.get(d) for d in _deletes1(key)}
+                candidates |= {self._fuzzy.get(d) for d in _deletes1(key)}
+                candidates.discard(None)
+                if len(candidates) == 1:
+                    row = candidates.pop()
+        return self.payloads[row] if row is not None else None
+
+
+def _content_key(p: Dict[str, Any]) -> str:
+    return p.get("__content_hash") or p.get("__search_blob") or ""
+
+
+def _rrf_fuse(
+    dense_hits: List[Tuple[float, Dict[str, Any]]],
+    lexical_hits: List[Tuple[float, Dict[str, Any]]],
+    qvec: List[float],
+) -> Tuple[List[Tuple[float, Dict[str, Any]]], Dict[str, float]]:
+    """
+    Reciprocal-rank fusion. The base score is always the query cosine:
+    from the dense pass where the scheme was a dense hit, else looked up
+    from the stored vectors, so min_score / routing thresholds keep their
+    meaning for lexical-only hits too.
+    """
+    rrf: Dict[str, float] = {}
+    base: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    for rank, (cos, p) in enumerate(dense_hits):
+        key = _content_key(p)
+        rrf[key] = rrf.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+        base[key] = (cos, p)
+
+    lexical_only = []
+    for rank, (_bm25, p) in enumerate(lexical_hits):
+        key = _content_key(p)
+        rrf[key] = rrf.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+        if key not in base:
+            lexical_only.append(p)
+    for p, cos in zip(lexical_only, _scheme_cosines(qvec, lexical_only)):
+        base[_content_key(p)] = (cos, p)
+
+    fused = sorted(base.items(), key=lambda kv: rrf[kv[0]], reverse=True)
+    return [hit for _key, hit in fused], rrf
+
+
+def _cached_scheme_cosines(
+    question: str, payloads: List[Dict[str, Any]]
+) -> Optional[List[float]]:
+    """
+    Stored-vector cosines only when they are free: the query vector is
+    already in query_embed_cache and the vectors are in memory. None otherwise.
+    """
+    if SCHEMES_VECTOR_ENGINE != "memory":
+        return None
+    qvec = query_embed_cache.get(EMBED_MODEL_NAME_SCHEMES, question)
+    if qvec is None:
+        return None
+    return _scheme_cosines(qvec.tolist(), payloads)
+
+
+def _confident_lexical_hits(
+    question: str, lexical_hits: List[Tuple[float, Dict[str, Any]]]
+) -> Tuple[List[Tuple[float, Dict[str, Any]]], Dict[str, float]]:
+    """
+    Confident BM25 result without a model call: kept in BM25 order (rank
+    reciprocals as the sort key). Base score is the free cached cosine when
+    available, else BM25 relative to the top hit.
+    """
+    payloads = [p for _bm25, p in lexical_hits]
+    cosines = _cached_scheme_cosines(question, payloads)
+    if cosines is None:
+        top = lexical_hits[0][0] if lexical_hits else 1.0
+        cosines = [bm25 / (top or 1.0) for bm25, _p in lexical_hits]
+    rrf = {
+        _content_key(p): 1.0 / (RRF_K + rank + 1) for rank, p in enumerate(payloads)
+    }
+    return list(zip(cosines, payloads)), rrf
+
+
+def _name_hit_result(question: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    p = dict(payload)
+    cosines = _cached_scheme_cosines(question, [payload])
+    p["_score"] = cosines[0] if cosines else SCHEMES_NAME_SCORE
+    p["_final_score"] = SCHEMES_NAME_SCORE
+    p["_match"] = "name"
+    return p
+
+
+def _rank_schemes(
+    question: str,
+    fetch: int,
+    min_score: float,
+    category: Optional[str],
+    department: Optional[str],
+    typ: Optional[str],
+    retrieval: str,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Ranked candidates (at most `fetch` of them) and whether the index has
+    no further results beyond them. Duplicates are merged at index time
+    (see _canonical_schemes), so there is no dedupe pass here.
+    """
+    scheme_indexes_fingerprint()  # catalog edited on disk -> fresh indexes first
+    rrf: Dict[str, float] = {}
+    if SCHEMES_NAME_FASTPATH and not (category or department or typ):
+        name_hit = get_scheme_name_index().lookup(question)
+        if name_hit is not None:
+            # confident name lookup: no query embedding, no vector search
+            return [_name_hit_result(question, name_hit)], True
+
+    if retrieval == "hybrid":
+        lexical_hits, confident = get_scheme_bm25_index().search(
+            question, fetch, category, department, typ
+        )
+        if confident:
+            # bare scheme name: keep the BM25 order, no embedding, no vector search
+            hits, rrf = _confident_lexical_hits(question, lexical_hits)
+            exhausted = len(lexical_hits) < fetch
+        else:
+            qvec = embed_scheme_query(question).tolist()
+            dense_hits = _scheme_vector_search(qvec, fetch, category, department, typ)
+            hits, rrf = _rrf_fuse(dense_hits, lexical_hits, qvec)
+            exhausted = len(dense_hits) < fetch and len(lexical_hits) < fetch
+    else:
+        qvec = embed_scheme_query(question).tolist()
+        hits = _scheme_vector_search(qvec, fetch, category, department, typ)
+        exhausted = len(hits) < fetch
+
+    kw_boosts = get_scheme_lexical_index().boosts(
+        question, [payload.get("__content_hash", "") for _, payload in hits]
+    )
+
+    scored: List[Dict[str, Any]] = []
+    for (base_score, payload), kw_boost in zip(hits, kw_boosts):
+        if base_score < min_score:
+            continue
+        p = dict(payload)
+        if kw_boost is None:
+            # point indexed before __content_hash existed
+            kw_boost = _keyword_boost(question, p)
+        final_score = base_score + kw_boost
+        p["_score"] = base_score
+        p["_final_score"] = final_score
+        if rrf:
+            p["_rrf_score"] = rrf.get(_content_key(p), 0.0)
+        scored.append(p)
+
+    sort_key = "_rrf_score" if rrf else "_final_score"
+    scored.sort(key=lambda x: x.get(sort_key, 0.0), reverse=True)
+    return scored, exhausted or fetch >= SCHEMES_MAX_FETCH
 
 
 def search_schemes(
@@ -8402,53 +10801,112 @@ def search_schemes(
     category: Optional[str] = None,
     department: Optional[str] = None,
     typ: Optional[str] = None,
-):
-    qvec = scheme_embed_model.encode(question).tolist()
+    retrieval: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Returns (page_items, total_found). Only page*limit + SCHEMES_FETCH_MARGIN
+    candidates are ranked, so total_found is exact only when the index ran
+    out of matches before that; otherwise it is a LOWER BOUND. Do not build
+    page counts from it: use search_schemes_cursor / next_cursor instead.
+    """
     page = max(page, 1)
     limit = max(1, min(20, limit))
+    retrieval = (retrieval or SCHEMES_RETRIEVAL_MODE).lower()
 
-    MAX_HITS = 50
+    # only what this page needs (+ margin), not a fixed 50 hits
+    fetch = min(page * limit + SCHEMES_FETCH_MARGIN, SCHEMES_MAX_FETCH)
+    ranked, _exhausted = _rank_schemes(
+        question, fetch, min_score, category, department, typ, retrieval
+    )
 
-    hits = scheme_qdrant.search(
-        collection_name=SCHEMES_COLLECTION,
-        query_vector=qvec,
-        limit=MAX_HITS,
-        with_payload=True,
-        with_vectors=False,
-        query_filter=_qdrant_filter(category, department, typ),
+    total_found = len(ranked)  # lower bound unless _exhausted
+    start = (page - 1) * limit
+    end = start + limit
+    page_items = ranked[start:end]
+
+    return page_items, total_found
+
+
+# ---- cursor pagination ----
+
+# query key -> (created, ranked candidates, exhausted)
+_scheme_cursor_cache: "OrderedDict[str, Tuple[float, List[Dict[str, Any]], bool]]" = OrderedDict()
+_scheme_cursor_lock = threading.Lock()
+_SCHEME_CURSOR_CACHE_SIZE = 512
+
+
+def _scheme_query_key(question, min_score, category, department, typ, retrieval) -> str:
+    raw = json.dumps(
+        [_norm(question), min_score, category, department, typ, retrieval,
+         schemes_index_fingerprint()],
+        ensure_ascii=False,
     )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
 
-    scored: List[Dict[str, Any]] = []
-    for h in hits:
-        base_score = float(h.score) if hasattr(h, "score") else 0.0
-        if base_score < min_score:
-            continue
-        p = dict(h.payload)
-        kw_boost = _keyword_boost(question, p)
-        final_score = base_score + kw_boost
-        p["_score"] = base_score
-        p["_final_score"] = final_score
-        scored.append(p)
 
-    deduped: List[Dict[str, Any]] = []
-    seen = set()
-    for p in scored:
-        key = (p.get("name_hi") or p.get("name_en") or "").strip()
-        if not key:
-            key = p.get("id", "")
-        if key in seen:
-            continue
-        seen.add(key)
-        deduped.append(p)
+def _encode_cursor(key: str, offset: int) -> str:
+    raw = json.dumps({"k": key, "o": offset}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-    deduped.sort(key=lambda x: x.get("_final_score", 0.0), reverse=True)
 
-    total = len(deduped)
-    start = (page - 1) * limit
-    end = start + limit
-    page_items = deduped[start:end]
+def _decode_cursor(cursor: str, key: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(data["o"])
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if data.get("k") != key or offset < 0:
+        raise ValueError("Cursor does not belong to this query")
+    return offset
+
+
+def search_schemes_cursor(
+    question: str,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+    min_score: float = 0.20,
+    category: Optional[str] = None,
+    department: Optional[str] = None,
+    typ: Optional[str] = None,
+    retrieval: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Returns (items, next_cursor). Ranked candidates are kept per query for
+    SCHEMES_CURSOR_TTL seconds, so following a cursor is normally a slice;
+    the index is only searched again (with a larger fetch) when the next
+    page runs past what was fetched before.
+    """
+    limit = max(1, min(20, limit))
+    retrieval = (retrieval or SCHEMES_RETRIEVAL_MODE).lower()
+    key = _scheme_query_key(question, min_score, category, department, typ, retrieval)
+    offset = _decode_cursor(cursor, key) if cursor else 0
+    needed = offset + limit + SCHEMES_FETCH_MARGIN
+
+    now = time.time()
+    with _scheme_cursor_lock:
+        entry = _scheme_cursor_cache.get(key)
+    if entry is not None and now - entry[0] > SCHEMES_CURSOR_TTL:
+        entry = None
+
+    if entry is None or (len(entry[1]) < needed and not entry[2]):
+        fetch = min(max(needed, 2 * len(entry[1]) if entry else 0), SCHEMES_MAX_FETCH)
+        ranked, exhausted = _rank_schemes(
+            question, fetch, min_score, category, department, typ, retrieval
+        )
+        entry = (now, ranked, exhausted)
+        with _scheme_cursor_lock:
+            _scheme_cursor_cache[key] = entry
+            _scheme_cursor_cache.move_to_end(key)
+            while len(_scheme_cursor_cache) > _SCHEME_CURSOR_CACHE_SIZE:
+                _scheme_cursor_cache.popitem(last=False)
 
-    return page_items, total
+    ranked, exhausted = entry[1], entry[2]
+    items = ranked[offset : offset + limit]
+    next_offset = offset + limit
+    has_more = next_offset < len(ranked) or not exhausted
+    next_cursor = _encode_cursor(key, next_offset) if items and has_more else None
+    return items, next_cursor
 
 
 def _fmt_scheme_card(s: Dict[str, Any]) -> str:
@@ -8509,18 +10967,28 @@ def build_user_context(user_meta: dict | None) -> str:
     return "उपयोगकर्ता की जानकारी: " + ", ".join(parts) + ". "
 
 
-def build_schemes_answer(
+_NO_SCHEMES_ANSWER = (
+    "माफ़ कीजिए, इस सवाल से मिलती-जुलती कोई योजना नहीं मिली। "
+    "कृपया अलग शब्दों में पूछें, या ज़िला/विभाग/श्रेणी लिखें।\n\n"
+    "**English:** No strong matches. Try different words or add location/department."
+)
+
+
+def _schemes_fallback_answer(schemes: List[Dict[str, Any]]) -> str:
+    hdr = f"आपके सवाल के आधार पर {len(schemes)} योजनाएँ मिलीं:\n\n"
+    body = "\n\n".join(_fmt_scheme_card(s) for s in schemes)
+    eng = (
+        "\n\n**English:** Listed top matches with eligibility, benefits and how to apply."
+    )
+    return hdr + body + eng
+
+
+def _build_schemes_prompt(
     question: str,
     schemes: List[Dict[str, Any]],
     user_meta: Dict[str, Any] | None = None,
+    target_lang: Optional[str] = None,
 ) -> str:
-    if not schemes:
-        return (
-            "माफ़ कीजिए, इस सवाल से मिलती-जुलती कोई योजना नहीं मिली। "
-            "कृपया अलग शब्दों में पूछें, या ज़िला/विभाग/श्रेणी लिखें।\n\n"
-            "**English:** No strong matches. Try different words or add location/department."
-        )
-
     user_ctx = build_user_context(user_meta)
 
     q_low = question.lower()
@@ -8564,14 +11032,6 @@ def build_schemes_answer(
         ]
     )
 
-    if not GROQ_API_KEY:
-        hdr = f"आपके सवाल के आधार पर {len(schemes)} योजनाएँ मिलीं:\n\n"
-        body = "\n\n".join(_fmt_scheme_card(s) for s in schemes)
-        eng = (
-            "\n\n**English:** Listed top matches with eligibility, benefits and how to apply."
-        )
-        return hdr + body + eng
-
     context_lines = []
     for s in schemes:
         context_lines.append(
@@ -8659,22 +11119,41 @@ Now write the final answer in a natural, fluent, friendly tone.
 --------------------------------------------
 """
 
+    rules = _output_language_rules(target_lang)
+    if rules:
+        prompt += f"\n### 🗣️ {rules}\n"
+
+    return prompt
+
+
+async def build_schemes_answer_async(
+    question: str,
+    schemes: List[Dict[str, Any]],
+    user_meta: Dict[str, Any] | None = None,
+    target_lang: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """
+    target_lang: answer directly in that language (single-pass); None = Hindi.
+    Returns (answer, generated); generated=False for the canned fallbacks.
+    """
+    if not schemes:
+        return await _localize_static(_NO_SCHEMES_ANSWER, target_lang), False
+    if not GROQ_API_KEY:
+        return await _localize_static(_schemes_fallback_answer(schemes), target_lang), False
+
+    prompt = _build_schemes_prompt(question, schemes, user_meta, target_lang)
+
     try:
-        completion = groq_client.chat.completions.create(
+        completion = await get_async_groq_client().chat.completions.create(
             model=LLM_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
         )
         ai_answer = completion.choices[0].message.content.strip()
     except Exception:
-        hdr = f"आपके सवाल के आधार पर {len(schemes)} योजनाएँ मिलीं:\n\n"
-        body = "\n\n".join(_fmt_scheme_card(s) for s in schemes)
-        eng = (
-            "\n\n**English:** Listed top matches with eligibility, benefits and how to apply."
-        )
-        return hdr + body + eng
+        return await _localize_static(_schemes_fallback_answer(schemes), target_lang), False
 
-    return ai_answer
+    return ai_answer, True
 
 
 def _should_use_schemes(question: str, schemes: List[Dict[str, Any]]) -> bool:
@@ -8739,39 +11218,40 @@ class SchemeCard(SQLModel):
 # ================== RECOMMENDATIONS ==================
 
 
-@app.get("/user/recommended-schemes", response_model=List[SchemeCard])
-def recommended_schemes(current_user: User = Depends(get_current_user)):
+def _recommendation_query(user: User) -> str:
     parts = []
 
-    if current_user.district:
-        parts.append(current_user.district)
-    if current_user.block:
-        parts.append(current_user.block)
-    if current_user.gender:
-        parts.append(current_user.gender)
-    if current_user.age:
-        parts.append(f"age {current_user.age}")
-    if current_user.interest_tag:
-        parts.append(current_user.interest_tag)
-
-    if current_user.occupation:
-        parts.append(current_user.occupation)
-    if current_user.disability and current_user.disability.lower() not in (
+    if user.district:
+        parts.append(user.district)
+    if user.block:
+        parts.append(user.block)
+    if user.gender:
+        parts.append(user.gender)
+    if user.age:
+        parts.append(f"age {user.age}")
+    if user.interest_tag:
+        parts.append(user.interest_tag)
+
+    if user.occupation:
+        parts.append(user.occupation)
+    if user.disability and user.disability.lower() not in (
         "none",
         "nahin",
         "no",
     ):
         parts.append("divyang")
-        parts.append(current_user.disability)
-    if current_user.income_bracket:
-        parts.append(current_user.income_bracket)
-    if current_user.social_category:
-        parts.append(current_user.social_category)
+        parts.append(user.disability)
+    if user.income_bracket:
+        parts.append(user.income_bracket)
+    if user.social_category:
+        parts.append(user.social_category)
+
+    return " ".join(parts) or "gramin yojana"
 
-    question = " ".join(parts) or "gramin yojana"
 
+def compute_recommendations(user: User) -> List[SchemeCard]:
     schemes, _total = search_schemes(
-        question=question,
+        question=_recommendation_query(user),
         limit=5,
         page=1,
         min_score=0.20,
@@ -8800,6 +11280,114 @@ def recommended_schemes(current_user: User = Depends(get_current_user)):
         )
     return cards
 
+
+def store_recommendations(session: Session, user: User) -> List[SchemeCard]:
+    # the catalog version the indexes actually serve, not just what is on disk
+    fingerprint = scheme_indexes_fingerprint()
+    cards = compute_recommendations(user)
+    row = session.get(UserRecommendation, user.id)
+    if row is None:
+        row = UserRecommendation(
+            user_id=user.id, index_fingerprint="", cards_json="[]", updated_at=0.0
+        )
+    row.index_fingerprint = fingerprint
+    row.cards_json = json.dumps([c.dict() for c in cards], ensure_ascii=False)
+    row.updated_at = time.time()
+    session.add(row)
+    session.commit()
+    return cards
+
+
+def refresh_user_recommendations(user_id: int) -> None:
+    # runs as a BackgroundTask after register / profile update, after the response
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        if user:
+            store_recommendations(session, user)
+
+
+def refresh_all_recommendations() -> int:
+    """
+    Batch job for after a catalog update:
+        python -c "import app; app.refresh_all_recommendations()"
+    """
+    count = 0
+    with Session(engine) as session:
+        for user in session.exec(select(User)).all():
+            store_recommendations(session, user)
+            count += 1
+    print(f"✅ Refreshed recommendations for {count} users")
+    return count
+
+
+@app.get("/user/recommended-schemes", response_model=List[SchemeCard])
+def recommended_schemes(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    row = session.get(UserRecommendation, current_user.id)
+    if row is not None and row.index_fingerprint == schemes_index_fingerprint():
+        return [SchemeCard(**c) for c in json.loads(row.cards_json)]
+
+    # missing or built against an older scheme index
+    return store_recommendations(session, current_user)
+
+# ================== DOCS BATCH RETRIEVAL API ==================
+
+
+class DocsBatchRequest(BaseModel):
+    queries: List[str]
+    top_k: int = 8
+
+
+class DocsBatchResponse(BaseModel):
+    results: List[List[Dict[str, Any]]] = []
+
+
+@app.post("/docs/retrieve/batch", response_model=DocsBatchResponse)
+def docs_retrieve_batch(req: DocsBatchRequest):
+    if len(req.queries) > DOCS_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {DOCS_BATCH_MAX_QUERIES} queries per request",
+        )
+    top_k = max(1, min(50, req.top_k))
+    return DocsBatchResponse(results=retrieve_docs_context_batch(req.queries, top_k=top_k))
+
+# ================== SCHEMES SEARCH API ==================
+
+
+class SchemeSearchResponse(BaseModel):
+    items: List[Dict[str, Any]] = []
+    next_cursor: Optional[str] = None
+
+
+@app.get("/schemes/search", response_model=SchemeSearchResponse)
+def schemes_search(
+    q: str,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    department: Optional[str] = None,
+    typ: Optional[str] = None,
+    retrieval: Optional[str] = None,
+):
+    try:
+        items, next_cursor = search_schemes_cursor(
+            question=q,
+            limit=limit,
+            cursor=cursor,
+            category=category,
+            department=department,
+            typ=typ,
+            retrieval=retrieval,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    public = [{k: v for k, v in s.items() if not k.startswith("__")} for s in items]
+    return SchemeSearchResponse(items=public, next_cursor=next_cursor)
+
 # ================== HTML DEMO ROUTES ==================
 
 
@@ -8845,9 +11433,11 @@ async def post_query(
         target_lang = "garhwali"
     else:
         target_lang = "hi" if contains_devanagari(query) else "hinglish"
+    single_pass = _single_pass_lang(target_lang)
 
     if mode == "schemes":
-        schemes, _ = search_schemes(
+        schemes, _ = await run_blocking(
+            search_schemes,
             question=query,
             limit=3,
             page=1,
@@ -8856,11 +11446,18 @@ async def post_query(
             department=None,
             typ=None,
         )
-        base_answer = build_schemes_answer(query, schemes)
+        base_answer, _generated = await build_schemes_answer_async(
+            query, schemes, target_lang=single_pass
+        )
     else:
-        base_answer, _sources = generate_docs_answer_raw(query, history)
+        base_answer, _sources = await generate_docs_answer_raw_async(
+            query, history, target_lang=single_pass
+        )
 
-    final_text = translate_answer(base_answer, target_lang)
+    if single_pass:
+        final_text = base_answer
+    else:
+        final_text = await translate_answer_async(base_answer, target_lang)
     answer_html = _convert_markdown_bold_to_html(final_text)
 
     history.append({"role": "user", "content": query})
@@ -8879,63 +11476,277 @@ async def post_query(
         },
     )
 
+# ================== SEMANTIC ANSWER CACHE ==================
+
+
+def _profile_bucket(user_meta: Dict[str, Any] | None) -> str:
+    """Coarse profile key: answers only differ meaningfully along these."""
+    if not user_meta:
+        return "-"
+    age = user_meta.get("age")
+    try:
+        age_band = "child" if int(age) < 18 else ("senior" if int(age) >= 60 else "adult")
+    except (TypeError, ValueError):
+        age_band = ""
+    disability = (user_meta.get("disability") or "").lower()
+    parts = [
+        # location + interest go into the prompt verbatim (build_user_context)
+        str(user_meta.get("district") or "").lower(),
+        str(user_meta.get("block") or "").lower(),
+        str(user_meta.get("village_code") or "").lower(),
+        str(user_meta.get("interest_tag") or "").lower(),
+        age_band,
+        (user_meta.get("gender") or "").lower(),
+        "divyang" if disability and disability not in ("none", "nahin", "no") else "",
+        (user_meta.get("social_category") or "").lower(),
+        (user_meta.get("occupation") or "").lower(),
+        (user_meta.get("income_bracket") or "").lower(),
+    ]
+    return "|".join(parts)
+
+
+class SemanticAnswerCache:
+    """
+    Stores finished AskResponse payloads per (mode, target lang, profile
+    bucket) with the normalised question embedding and a retrieval
+    signature (top scheme ids). A new question gets a stored answer back
+    only if its cosine is >= threshold AND its signature is the same.
+    """
+
+    def __init__(self, threshold: float, ttl: int, max_entries: int):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # bucket -> {"vecs": [np.ndarray], "entries": [(created, signature, response dict)],
+        #            "matrix": np.ndarray | None}
+        self._buckets: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._order: "deque[Tuple[Tuple[str, str, str], float]]" = deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(vec) -> np.ndarray:
+        v = np.asarray(vec, dtype=np.float32)
+        n = float(np.linalg.norm(v))
+        return v / n if n else v
+
+    def get(
+        self, bucket: Tuple[str, str, str], vec, signature: Tuple[str, ...]
+    ) -> Optional[Dict[str, Any]]:
+        q = self._unit(vec)
+        now = time.time()
+        with self._lock:
+            b = self._buckets.get(bucket)
+            if b and b["vecs"]:
+                if b["matrix"] is None:
+                    b["matrix"] = np.vstack(b["vecs"])
+                sims = b["matrix"] @ q
+                for i in np.argsort(-sims):
+                    if sims[i] < self.threshold:
+                        break
+                    created, sig, response = b["entries"][i]
+                    if (
+                        sig == signature
+                        and now - created <= self.ttl
+                        and _cached_audio_available(response.get("audio_url"))
+                    ):
+                        self.hits += 1
+                        return response
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        bucket: Tuple[str, str, str],
+        vec,
+        signature: Tuple[str, ...],
+        response: Dict[str, Any],
+    ) -> None:
+        created = time.time()
+        with self._lock:
+            b = self._buckets.setdefault(bucket, {"vecs": [], "entries": [], "matrix": None})
+            b["vecs"].append(self._unit(vec))
+            b["entries"].append((created, signature, response))
+            b["matrix"] = None
+            self._order.append((bucket, created))
+            if len(self._order) > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        bucket, created = self._order.popleft()
+        b = self._buckets.get(bucket)
+        if not b:
+            return
+        for i, (c, _sig, _resp) in enumerate(b["entries"]):
+            if c == created:
+                del b["entries"][i]
+                del b["vecs"][i]
+                b["matrix"] = None
+                break
+        if not b["entries"]:
+            del self._buckets[bucket]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._order),
+            "buckets": len(self._buckets),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def _cached_audio_available(audio_url: Optional[str]) -> bool:
+    if not audio_url:
+        return True
+    return tts_store.contains_url(audio_url)
+
+
+semantic_answer_cache = SemanticAnswerCache(
+    SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_TTL, SEMANTIC_CACHE_MAX_ENTRIES
+)
+
+
+def _retrieval_signature(question: str) -> Tuple[str, ...]:
+    # top scheme ids: "vridha pension" and "vidhwa pension" embed closely but retrieve differently
+    schemes, _ = search_schemes(
+        question=question, limit=SEMANTIC_CACHE_SIG_SCHEMES, page=1, min_score=0.20
+    )
+    return tuple(_content_key(s) for s in schemes)
+
+
+async def _semantic_cache_key(req: AskRequest):
+    """
+    (bucket, question vector, retrieval signature), or None when the
+    request must not be cached.
+    """
+    if not SEMANTIC_CACHE_ENABLED or req.history or not req.question.strip():
+        # follow-up questions depend on the conversation, not just the text
+        return None
+    if req.mode == "docs":
+        return None  # answers depend on the retrieved passages; never cached
+    vec = await run_blocking(embed_scheme_query, req.question)
+    signature = await run_blocking(_retrieval_signature, req.question)
+    # answer language depends on the question's script, not only ui_lang
+    bucket = (req.mode, _ask_target_lang(req), _profile_bucket(req.user_meta))
+    return bucket, vec, signature
+
 # ================== CORE ASK LOGIC ==================
 
 
-def process_ask_request(req: AskRequest) -> AskResponse:
+def _scheme_sources(schemes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name_hi": s.get("name_hi"),
+            "name_en": s.get("name_en"),
+            "score": s.get("_score"),
+            "department": s.get("department"),
+            "category": s.get("category"),
+            "apply_link": s.get("apply_link"),
+        }
+        for s in schemes
+    ]
+
+
+def _ask_target_lang(req: AskRequest) -> str:
     # UI language se target lang decide
     if req.ui_lang == "en":
-        target_lang = "en"
-    elif req.ui_lang == "garhwali":
-        target_lang = "garhwali"
-    else:
-        target_lang = "hi" if contains_devanagari(req.question) else "hinglish"
+        return "en"
+    if req.ui_lang == "garhwali":
+        return "garhwali"
+    return "hi" if contains_devanagari(req.question) else "hinglish"
 
-    user_meta = req.user_meta or None
 
+async def _route_ask(
+    req: AskRequest,
+) -> Tuple[bool, List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+    """
+    Returns (use_schemes, schemes, docs_contexts). Docs retrieval starts
+    right away (speculatively in auto mode), so it overlaps with the scheme
+    search instead of following it.
+    """
     schemes: List[Dict[str, Any]] = []
-    doc_sources: List[Dict[str, Any]] = []
     use_schemes = False
 
-    # ---------- routing: schemes vs docs ----------
-    if req.mode in ("schemes", "auto"):
-        schemes, _ = search_schemes(
-            question=req.question,
-            limit=5,
-            page=1,
-            min_score=0.20,
-            category=None,
-            department=None,
-            typ=None,
-        )
-        if req.mode == "schemes":
-            use_schemes = True
-        else:
-            use_schemes = _should_use_schemes(req.question, schemes)
+    docs_task = None
+    if req.mode != "schemes":
+        docs_task = asyncio.create_task(retrieve_docs_context_async(req.question))
+
+    try:
+        # ---------- routing: schemes vs docs ----------
+        if req.mode in ("schemes", "auto"):
+            schemes, _ = await run_blocking(
+                search_schemes,
+                question=req.question,
+                limit=5,
+                page=1,
+                min_score=0.20,
+                category=None,
+                department=None,
+                typ=None,
+            )
+            if req.mode == "schemes":
+                use_schemes = True
+            else:
+                use_schemes = _should_use_schemes(req.question, schemes)
+
+        if use_schemes:
+            return True, schemes, None
+
+        contexts = await docs_task
+        docs_task = None
+        return False, schemes, pack_docs_contexts(contexts)
+    finally:
+        # scheme route taken, scheme search failed or we were cancelled
+        if docs_task is not None:
+            _discard_task(docs_task)
+
+
+async def process_ask_request(req: AskRequest) -> AskResponse:
+    cache_key = await _semantic_cache_key(req)
+    if cache_key is not None:
+        cached = semantic_answer_cache.get(*cache_key)
+        if cached is not None:
+            return AskResponse(**cached)
+
+    resp, generated = await _answer_ask_request(req)
+
+    # canned fallbacks (LLM down / no key / no match) are never cached
+    if cache_key is not None and generated:
+        semantic_answer_cache.put(*cache_key, resp.dict())
+    return resp
+
+
+async def _answer_ask_request(req: AskRequest) -> Tuple[AskResponse, bool]:
+    """Returns (response, generated): generated=False when a canned fallback was used."""
+    target_lang = _ask_target_lang(req)
+    single_pass = _single_pass_lang(target_lang)
+    user_meta = req.user_meta or None
+
+    use_schemes, schemes, contexts = await _route_ask(req)
 
     if use_schemes:
-        base_answer = build_schemes_answer(req.question, schemes, user_meta=user_meta)
-        sources = [
-            {
-                "name_hi": s.get("name_hi"),
-                "name_en": s.get("name_en"),
-                "score": s.get("_score"),
-                "department": s.get("department"),
-                "category": s.get("category"),
-                "apply_link": s.get("apply_link"),
-            }
-            for s in schemes
-        ]
+        base_answer, generated = await build_schemes_answer_async(
+            req.question, schemes, user_meta=user_meta, target_lang=single_pass
+        )
+        sources = _scheme_sources(schemes)
     else:
-        base_answer, doc_sources = generate_docs_answer_raw(
+        base_answer, sources = await generate_docs_answer_raw_async(
             req.question,
             req.history,
             user_meta=user_meta,
+            contexts=contexts,
+            target_lang=single_pass,
         )
-        sources = doc_sources
+        generated = bool(base_answer.strip())
 
     # ---------- translate to requested UI language ----------
-    final_text = translate_answer(base_answer, target_lang)
+    if single_pass:
+        final_text = base_answer  # already written in the target language
+    else:
+        final_text = await translate_answer_async(base_answer, target_lang)
     final_html = _convert_markdown_bold_to_html(final_text)
 
     # ---------- TTS for Garhwali (audio_url) ----------
@@ -8944,17 +11755,17 @@ def process_ask_request(req: AskRequest) -> AskResponse:
         # strip HTML to get plain text
         plain = re.sub("<[^<]+?>", "", final_html)
         if plain.strip():
-            filename = tts_garhwali(plain)
+            filename = await run_blocking(tts_garhwali, plain)
             audio_url = f"/tts/{filename}"
 
-    return AskResponse(response=final_html, sources=sources, audio_url=audio_url)
+    return AskResponse(response=final_html, sources=sources, audio_url=audio_url), generated
 
 # ================== JSON API FOR REACT CHAT ==================
 
 
 @app.post("/ask", response_model=AskResponse)
-def ask(req: AskRequest):
-    return process_ask_request(req)
+async def ask(req: AskRequest):
+    return await process_ask_request(req)
 
 
 @app.post("/voice/ask")
@@ -8963,46 +11774,304 @@ async def voice_ask(
     mode: str = "auto",
     ui_lang: str = "garhwali",
 ):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-        shutil.copyfileobj(audio.file, tmp)
-        tmp_path = tmp.name
-
+    data = await audio.read()
+    # decoded in memory (PyAV), no temp file on disk
+    samples = await run_blocking(decode_audio_bytes, data)
     try:
-        question_text = transcribe_garhwali_audio(tmp_path)
-
-        req = AskRequest(
-            question=question_text,
-            ui_lang=ui_lang,
-            mode=mode,
-            history=[],
-            user_meta=None,
-        )
+        segments = await transcribe_audio_async(samples)
+    except SpeechPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
+    question_text = " ".join(text for _s, _e, text in segments).strip()
+    return await _voice_answer(question_text, mode, ui_lang)
+
+
+async def _voice_answer(question_text: str, mode: str, ui_lang: str) -> Dict[str, Any]:
+    req = AskRequest(
+        question=question_text,
+        ui_lang=ui_lang,
+        mode=mode,
+        history=[],
+        user_meta=None,
+    )
 
-        ask_resp = process_ask_request(req)
-        answer_html = ask_resp.response
-        answer_plain = re.sub("<[^<]+?>", "", answer_html)
+    ask_resp = await process_ask_request(req)
+    answer_html = ask_resp.response
+    answer_plain = re.sub("<[^<]+?>", "", answer_html)
 
-        audio_filename = tts_garhwali(answer_plain)
+    # garhwali answers already carry audio from process_ask_request
+    audio_url = ask_resp.audio_url
+    if not audio_url:
+        audio_filename = await run_blocking(tts_garhwali, answer_plain)
         audio_url = f"/tts/{audio_filename}"
 
-        return {
-            "question_text": question_text,
-            "answer_html": answer_html,
-            "audio_url": audio_url,
-            "sources": ask_resp.sources,
-        }
+    return {
+        "question_text": question_text,
+        "answer_html": answer_html,
+        "audio_url": audio_url,
+        "sources": ask_resp.sources,
+    }
 
-    finally:
-        try:
-            os.remove(tmp_path)
-        except Exception:
-            pass
+
+@app.websocket("/voice/ask/ws")
+async def voice_ask_ws(
+    ws: WebSocket,
+    mode: str = "auto",
+    ui_lang: str = "garhwali",
+    format: str = "pcm16",
+):
+    """
+    Client streams binary audio frames (raw pcm16 16 kHz mono, or container
+    chunks such as webm/opus with ?format=webm) and may send {"type": "end"}.
+    Server sends {"type": "partial"} transcripts while audio arrives, then
+    {"type": "final"} once speech ends (client end, trailing silence or
+    VOICE_STREAM_MAX_SEC), then {"type": "answer", ...same body as /voice/ask}.
+    """
+    await ws.accept()
+    transcriber = StreamingTranscriber(format)
+    last_step = time.monotonic()
+
+    try:
+        while True:
+            msg = await ws.receive()
+            if msg["type"] == "websocket.disconnect":
+                return
+            if msg.get("bytes"):
+                transcriber.feed(msg["bytes"])
+            elif msg.get("text"):
+                try:
+                    control = json.loads(msg["text"])
+                except ValueError:
+                    control = {}
+                if control.get("type") == "end":
+                    break
+
+            if time.monotonic() - last_step < VOICE_STREAM_STEP_SEC:
+                continue
+            last_step = time.monotonic()
+            partial = await transcriber.step()
+            await ws.send_json({"type": "partial", "text": partial})
+            if transcriber.trailing_silence() or transcriber.duration >= VOICE_STREAM_MAX_SEC:
+                break
+
+        question_text = await transcriber.finish()
+        await ws.send_json({"type": "final", "text": question_text})
+        if not question_text:
+            await ws.send_json({"type": "error", "message": "no speech detected"})
+            await ws.close()
+            return
+
+        result = await _voice_answer(question_text, mode, ui_lang)
+        await ws.send_json({"type": "answer", **result})
+        await ws.close()
+    except WebSocketDisconnect:
+        return
+    except SpeechPoolBusy as e:
+        await ws.send_json({"type": "error", "message": str(e)})
+        await ws.close(code=1013)  # try again later
+
+# ================== STREAMING ASK (SSE) ==================
+
+# end of a sentence: danda / ? / ! / line break, or a full stop followed by
+# whitespace; the separator itself is kept with the chunk it ends
+_SENTENCE_END_RE = re.compile(r"(?:[।!?]+|\.(?=\s)|(?=\n))\s*")
+# "Rs. 500", "1. apply online", "Dr. Sharma": the full stop does not end a sentence
+_NOT_SENTENCE_END_RE = re.compile(
+    r"(?:\b(?:rs|dr|mr|mrs|smt|shri|sh|no|govt|dept|vs|etc)|\b\d+|\b[a-z])$", re.IGNORECASE
+)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_groq(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int] = None,
+):
+    kwargs: Dict[str, Any] = {}
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    stream = await get_async_groq_client().chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+        **kwargs,
+    )
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            yield delta
+
+
+async def _static_stream(text: str, target_lang: Optional[str] = None):
+    yield await _localize_static(text, target_lang)
+
+
+def _sentence_cuts(buf: str) -> List[Tuple[int, bool]]:
+    """(end offset, ends a paragraph) for every finished sentence in buf."""
+    cuts = []
+    for m in _SENTENCE_END_RE.finditer(buf):
+        if m.end() == len(buf) or m.end() == m.start():
+            continue  # separator may still grow, or nothing matched
+        if buf[m.start()] == "." and _NOT_SENTENCE_END_RE.search(buf[: m.start()]):
+            continue
+        cuts.append((m.end(), "\n\n" in m.group()))
+    return cuts
+
+
+async def _split_sentences(pieces, min_chars: int = STREAM_TRANSLATE_MIN_CHARS):
+    """
+    Re-chunk a token stream into runs of whole sentences, each with its
+    original trailing whitespace. Short sentences are grouped until a chunk
+    reaches min_chars or a paragraph ends (the last chunk may be partial).
+    """
+    buf = ""
+    async for piece in pieces:
+        buf += piece
+        start = 0
+        for end, paragraph in _sentence_cuts(buf):
+            if paragraph or end - start >= min_chars:
+                yield buf[start:end]
+                start = end
+        buf = buf[start:]
+    if buf:
+        yield buf
+
+
+def _answer_stream(
+    req: AskRequest,
+    use_schemes: bool,
+    schemes: List[Dict[str, Any]],
+    contexts: Optional[List[Dict[str, Any]]],
+    target_lang: Optional[str] = None,
+):
+    user_meta = req.user_meta or None
+    if use_schemes:
+        if not schemes:
+            return _static_stream(_NO_SCHEMES_ANSWER, target_lang)
+        if not GROQ_API_KEY:
+            return _static_stream(_schemes_fallback_answer(schemes), target_lang)
+        prompt = _build_schemes_prompt(req.question, schemes, user_meta, target_lang)
+        return _stream_groq([{"role": "user", "content": prompt}], LLM_MODEL, 0.2)
+
+    messages = _build_docs_messages(
+        req.question, req.history, user_meta, contexts or [], target_lang
+    )
+    return _stream_groq(messages, GROQ_MODEL_DOCS, 0.3, 900)
+
+
+async def _ask_event_stream(req: AskRequest):
+    """
+    Always ends with `done` or `error`: a failure anywhere (cache key,
+    routing / retrieval, Groq, TTS) becomes an `error` event instead of a
+    broken stream.
+    """
+    try:
+        async for event in _ask_events(req):
+            yield event
+    except Exception as e:
+        yield _sse("error", {"detail": str(e)})
+
+
+async def _ask_events(req: AskRequest):
+    cache_key = await _semantic_cache_key(req)
+    if cache_key is not None:
+        cached = semantic_answer_cache.get(*cache_key)
+        if cached is not None:
+            yield _sse("meta", {"mode": "cache", "sources": cached["sources"]})
+            yield _sse("token", {"text": cached["response"]})
+            yield _sse("done", cached)
+            return
+
+    target_lang = _ask_target_lang(req)
+
+    use_schemes, schemes, contexts = await _route_ask(req)
+    sources = _scheme_sources(schemes) if use_schemes else _docs_unique_sources(contexts or [])
+    yield _sse("meta", {"mode": "schemes" if use_schemes else "docs", "sources": sources})
+
+    single_pass = _single_pass_lang(target_lang)
+    # _answer_stream serves canned text when there is nothing for the LLM to do
+    generated = not use_schemes or bool(schemes and GROQ_API_KEY)
+
+    final_parts: List[str] = []
+    try:
+        if single_pass:
+            # model already writes the target language: forward tokens as they arrive
+            async for piece in _answer_stream(
+                req, use_schemes, schemes, contexts, single_pass
+            ):
+                final_parts.append(piece)
+                yield _sse("token", {"text": piece})
+        else:
+            # two-pass language (incl. 'hi' if not in SINGLE_PASS_LANGS), same as /ask:
+            # translate finished sentences / paragraphs while the model keeps writing
+            async for chunk in _split_sentences(
+                _answer_stream(req, use_schemes, schemes, contexts)
+            ):
+                body = chunk.strip()
+                if not body:
+                    final_parts.append(chunk)
+                    continue
+                translated = await translate_answer_async(body, target_lang)
+                # keep the model's own separators (paragraph / list breaks)
+                lead = chunk[: len(chunk) - len(chunk.lstrip())]
+                trail = chunk[len(chunk.rstrip()) :]
+                piece = lead + translated.strip() + trail
+                final_parts.append(piece)
+                yield _sse("token", {"text": piece})
+    except Exception as e:
+        if use_schemes and not final_parts and schemes:
+            generated = False
+            fallback = _schemes_fallback_answer(schemes)
+            try:
+                fallback = await _localize_static(fallback, target_lang)
+            except Exception:
+                pass  # translation is down too: the Hindi list is still useful
+            final_parts.append(fallback)
+            yield _sse("token", {"text": fallback})
+        else:
+            yield _sse("error", {"detail": str(e)})
+            return
+
+    final_html = _convert_markdown_bold_to_html("".join(final_parts).strip())
+
+    audio_url: Optional[str] = None
+    if req.ui_lang == "garhwali":
+        plain = re.sub("<[^<]+?>", "", final_html)
+        if plain.strip():
+            filename = await run_blocking(tts_garhwali, plain)
+            audio_url = f"/tts/{filename}"
+
+    done = {"response": final_html, "sources": sources, "audio_url": audio_url}
+    if cache_key is not None and generated and final_parts:
+        semantic_answer_cache.put(*cache_key, done)
+    yield _sse("done", done)
+
+
+@app.post("/ask/stream")
+async def ask_stream(req: AskRequest):
+    """
+    Server-Sent Events: `meta` (route + sources), many `token` events with
+    answer text, then `done` with the full HTML answer and audio_url.
+    """
+    return StreamingResponse(
+        _ask_event_stream(req),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 # ================== AUTH ROUTES ==================
 
 
 @app.post("/auth/register", response_model=UserRead)
-def register(user_in: UserCreate, session: Session = Depends(get_session)):
+def register(
+    user_in: UserCreate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+):
     existing = get_user_by_username(session, user_in.username)
     if existing:
         raise HTTPException(status_code=400, detail="Username already registered")
@@ -9025,6 +12094,7 @@ def register(user_in: UserCreate, session: Session = Depends(get_session)):
     session.add(user)
     session.commit()
     session.refresh(user)
+    background_tasks.add_task(refresh_user_recommendations, user.id)
     return user
 
 
@@ -9049,6 +12119,7 @@ def read_me(current_user: User = Depends(get_current_user)):
 @app.put("/me", response_model=UserRead)
 def update_me(
     user_update: UserUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -9059,6 +12130,7 @@ def update_me(
     session.add(current_user)
     session.commit()
     session.refresh(current_user)
+    background_tasks.add_task(refresh_user_recommendations, current_user.id)
     return current_user
 
 
@@ -9069,4 +12141,14 @@ def health():
         "docs_collection": DOC_COLLECTION,
         "schemes_collection": SCHEMES_COLLECTION,
         "embed_model_schemes": EMBED_MODEL_NAME_SCHEMES,
+        "schemes_vector_engine": SCHEMES_VECTOR_ENGINE,
+        "single_pass_langs": sorted(SINGLE_PASS_LANGS),
+        "docs_rerank_model": DOCS_RERANK_MODEL if DOCS_RERANK_ENABLED else None,
+        "models_loaded": sorted(_MODELS.keys()),
+        "query_embed_cache": query_embed_cache.stats(),
+        "translation_cache": translation_cache.stats(),
+        "semantic_answer_cache": semantic_answer_cache.stats(),
+        "asr_pool": _MODELS["asr_pool"].stats() if "asr_pool" in _MODELS else None,
+        "asr_tiering": asr_scheduler.stats(),
+        "tts_store": tts_store.stats(),
     }
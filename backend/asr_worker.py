@@ -0,0 +1,79 @@
+# asr_worker.py
+"""
+Speech-to-text worker process for the /voice pool in app.py.
+
+Kept separate from app.py so spawned workers import only faster-whisper,
+not the whole FastAPI app. Each process loads its WhisperModel(s) lazily,
+one per model size, with its own CPU thread budget.
+
+With ASR_TIERING every worker can end up holding base + small + medium
+(int8 on CPU: roughly 0.1 + 0.3 + 0.8 GB resident). max_models caps how
+many sizes stay loaded; the least recently used one is dropped first.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+_config: Dict[str, Any] = {"device": "cpu", "compute_type": "int8", "cpu_threads": 0}
+_max_models = 3
+_models: "OrderedDict[str, Any]" = OrderedDict()
+
+Segment = Tuple[float, float, str]
+
+
+def init_worker(device: str, compute_type: str, cpu_threads: int, max_models: int = 3) -> None:
+    global _max_models
+    _config.update(device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+    _max_models = max(1, max_models)
+
+
+def load_model(name: str, device: str, compute_type: str, cpu_threads: int = 0):
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        name,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=1,
+    )
+
+
+def _model(name: str):
+    model = _models.get(name)
+    if model is None:
+        while len(_models) >= _max_models:
+            _models.popitem(last=False)
+        model = load_model(name, **_config)
+        _models[name] = model
+    else:
+        _models.move_to_end(name)
+    return model
+
+
+def run_whisper_scored(model, audio) -> Tuple[List[Segment], float]:
+    """
+    audio: path, file-like object or 16 kHz float32 array.
+    Returns ([(start, end, text)], avg_logprob weighted by segment duration).
+    """
+    segments, info = model.transcribe(
+        audio,
+        language="hi",
+        task="transcribe",
+        vad_filter=True,
+    )
+    out: List[Segment] = []
+    weighted, total = 0.0, 0.0
+    for seg in segments:
+        dur = max(seg.end - seg.start, 0.01)
+        weighted += seg.avg_logprob * dur
+        total += dur
+        if seg.text.strip():
+            out.append((seg.start, seg.end, seg.text.strip()))
+    return out, (weighted / total if total else 0.0)
+
+
+def transcribe_batch(jobs: List[Tuple[np.ndarray, str]]) -> List[Tuple[List[Segment], float]]:
+    """One pool task = several short utterances, decoded back to back in this process."""
+    return [run_whisper_scored(_model(model_name), audio) for audio, model_name in jobs]
@@ -0,0 +1,224 @@
+# bench_answer_language.py
+"""
+Two-pass (Hindi answer -> translate_answer_async) vs single-pass (target-language
+rules folded into the generation prompt) for the /ask pipeline.
+
+Run from backend/ with the usual .env (GROQ_API_KEY, QDRANT_URL, ...):
+
+    python bench_answer_language.py
+    python bench_answer_language.py --langs hinglish,garhwali --questions qs.txt --judge
+
+The translation cache is swapped for an empty, memory-only one that keeps
+nothing, so two-pass rows always pay for their translation call (pass
+--translation-cache to measure warm-cache behaviour instead).
+
+Per language and approach it reports wall time, Groq calls, prompt /
+completion tokens and cheap quality proxies:
+  - script_ok   : answer is in the expected script (Devanagari / Roman)
+  - hindi_leak  : Hindi helper verbs per 100 words (Garhwali only, lower = better)
+  - gw_markers  : Garhwali forms per 100 words (Garhwali only, higher = better)
+  - names_kept  : share of matched scheme names that survive verbatim
+  - judge       : optional 1-5 LLM rating of fluency + faithfulness (--judge)
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from statistics import mean
+from typing import Any, Dict, List, Optional
+
+import app
+
+DEFAULT_QUESTIONS = [
+    "vridha pension kaise milegi",
+    "अटल आवास योजना के लिए कौन पात्र है",
+    "divyang chhatravritti me kitna paisa milta hai",
+    "lakhpati didi yojana ka labh kya hai",
+    "gram sabha ki baithak saal me kitni baar hoti hai",
+    "ग्राम प्रधान के मुख्य कर्तव्य क्या हैं",
+]
+
+HINDI_HELPERS = ["है", "हैं", "था", "थी", "थे", "होगा", "करना"]
+GARHWALI_MARKERS = ["च", "छन", "लागि", "त्यूँ", "त्यूँकु", "करणु", "करणो", "स्यूँ", "कु"]
+
+
+class GroqCounter:
+    """Wraps chat.completions.create on the shared async client to count calls / tokens."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def install(self) -> None:
+        completions = app.get_async_groq_client().chat.completions
+        original = completions.create
+
+        async def create(*args, **kwargs):
+            self.calls += 1
+            out = await original(*args, **kwargs)
+            usage = getattr(out, "usage", None)
+            if usage is not None:
+                self.prompt_tokens += usage.prompt_tokens or 0
+                self.completion_tokens += usage.completion_tokens or 0
+            return out
+
+        completions.create = create
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[\wऀ-ॿ]+", text)
+
+
+def script_ok(text: str, target_lang: str) -> bool:
+    deva = len(re.findall(r"[ऀ-ॿ]", text))
+    latin = len(re.findall(r"[A-Za-z]", text))
+    total = deva + latin or 1
+    if target_lang == "hinglish":
+        return latin / total >= 0.8
+    return deva / total >= 0.8
+
+
+def per_100_words(text: str, forms: List[str]) -> float:
+    words = _words(text)
+    if not words:
+        return 0.0
+    hits = sum(1 for w in words if w in forms)
+    return round(100.0 * hits / len(words), 2)
+
+
+def names_kept(text: str, schemes: List[Dict[str, Any]]) -> Optional[float]:
+    names = [s.get("name_hi") for s in schemes[:3] if s.get("name_hi")]
+    if not names:
+        return None
+    return sum(1 for n in names if n in text) / len(names)
+
+
+async def judge(question: str, answer: str, target_lang: str) -> Optional[int]:
+    prompt = (
+        "Rate the ANSWER to the village user's QUESTION from 1 (bad) to 5 (excellent) "
+        f"for fluency in {target_lang} and faithfulness to a helpful, correct answer. "
+        "Reply with a single digit only.\n\n"
+        f"QUESTION: {question}\n\nANSWER:\n{answer}"
+    )
+    completion = await app.get_async_groq_client().chat.completions.create(
+        model=app.LLM_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.0,
+        max_tokens=2,
+    )
+    m = re.search(r"[1-5]", completion.choices[0].message.content or "")
+    return int(m.group()) if m else None
+
+
+async def answer(question: str, target_lang: str, single_pass: bool):
+    """Same async functions the /ask pipeline uses."""
+    schemes, _ = await app.run_blocking(
+        app.search_schemes, question=question, limit=5, page=1, min_score=0.20
+    )
+    lang_arg = target_lang if single_pass else None
+
+    if app._should_use_schemes(question, schemes):
+        text, _generated = await app.build_schemes_answer_async(
+            question, schemes, target_lang=lang_arg
+        )
+    else:
+        schemes = []
+        text, _sources = await app.generate_docs_answer_raw_async(
+            question, [], target_lang=lang_arg
+        )
+
+    if not single_pass:
+        text = await app.translate_answer_async(text, target_lang)
+    return text, schemes
+
+
+async def run(questions: List[str], langs: List[str], use_judge: bool) -> List[Dict[str, Any]]:
+    counter = GroqCounter()
+    counter.install()
+
+    rows = []
+    for target_lang in langs:
+        for single_pass in (False, True):
+            stats: Dict[str, List[float]] = {
+                "seconds": [], "calls": [], "prompt_tokens": [], "completion_tokens": [],
+                "script_ok": [], "hindi_leak": [], "gw_markers": [], "names_kept": [], "judge": [],
+            }
+            for q in questions:
+                before = counter.snapshot()
+                t0 = time.perf_counter()
+                text, schemes = await answer(q, target_lang, single_pass)
+                stats["seconds"].append(time.perf_counter() - t0)
+                after = counter.snapshot()
+                for k in ("calls", "prompt_tokens", "completion_tokens"):
+                    stats[k].append(after[k] - before[k])
+
+                stats["script_ok"].append(1.0 if script_ok(text, target_lang) else 0.0)
+                if target_lang == "garhwali":
+                    stats["hindi_leak"].append(per_100_words(text, HINDI_HELPERS))
+                    stats["gw_markers"].append(per_100_words(text, GARHWALI_MARKERS))
+                kept = names_kept(text, schemes)
+                if kept is not None:
+                    stats["names_kept"].append(kept)
+                if use_judge:
+                    score = await judge(q, text, target_lang)
+                    if score is not None:
+                        stats["judge"].append(score)
+
+            row = {
+                "lang": target_lang,
+                "approach": "single-pass" if single_pass else "two-pass",
+            }
+            for k, values in stats.items():
+                row[k] = round(mean(values), 3) if values else None
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--langs", default="hi,hinglish,garhwali")
+    parser.add_argument("--questions", help="text file, one question per line")
+    parser.add_argument("--judge", action="store_true", help="add an LLM 1-5 rating")
+    parser.add_argument("--json", help="also write the rows to this file")
+    parser.add_argument(
+        "--translation-cache",
+        action="store_true",
+        help="keep the app's (persistent) translation cache instead of disabling it",
+    )
+    args = parser.parse_args()
+
+    if not args.translation_cache:
+        # size 0, no SQLite file: every get misses and put keeps nothing
+        app.translation_cache = app.TranslationCache(0, "")
+
+    if args.questions:
+        with open(args.questions, "r", encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+    else:
+        questions = DEFAULT_QUESTIONS
+
+    langs = [l.strip() for l in args.langs.split(",") if l.strip()]
+    # one event loop for the whole run: the async Groq client is bound to it
+    rows = asyncio.run(run(questions, langs, args.judge))
+
+    cols = list(rows[0].keys())
+    print(" | ".join(cols))
+    for row in rows:
+        print(" | ".join("-" if row[c] is None else str(row[c]) for c in cols))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
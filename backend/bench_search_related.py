@@ -0,0 +1,151 @@
+# bench_search_related.py
+"""
+Latency of services.search.search_related before / after reusing stored
+vectors for MMR (no per-candidate re-encoding of payload text).
+
+Run from backend/ (needs the services qdrant_data folder and the models):
+
+    python bench_search_related.py
+    python bench_search_related.py --queries qs.txt --repeat 5 --top-k 10
+
+"legacy" is the original implementation, kept here verbatim for comparison.
+Per approach it reports mean / p50 / p95 milliseconds per query, plus how
+many of the returned documents both approaches agree on.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from statistics import mean
+from typing import Any, Dict, List
+
+import numpy as np
+
+# services/search.py uses package-relative imports: import it as backend.services
+BACKEND_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR.parent))
+os.chdir(BACKEND_DIR)
+
+from qdrant_client.models import SearchParams  # noqa: E402
+
+from backend.services import search  # noqa: E402
+from backend.utils.nlp_normalize import normalize_query  # noqa: E402
+
+DEFAULT_QUERIES = [
+    "vridha pension kaise milegi",
+    "अटल आवास योजना के लिए कौन पात्र है",
+    "divyang chhatravritti",
+    "widow pension uttarakhand",
+    "kisan ko kya labh milta hai",
+    "शादी अनुदान योजना",
+]
+
+
+def search_related_legacy(raw_query: str, top_k=10):
+    q, _ = normalize_query(raw_query)
+    vec = search._emb([q])[0].tolist()
+
+    hits = search.qdr.search(
+        collection_name=search.COLL,
+        query_vector=vec,
+        limit=36,
+        search_params=SearchParams(hnsw_ef=128, exact=False),
+        with_payload=True
+    )
+    if not hits: return []
+
+    pairs = [(q, h.payload.get("combined_text","")) for h in hits]
+    scores = search.RERANK.predict(pairs)
+    ranked = [h for h,_s in sorted(zip(hits, scores), key=lambda z:z[1], reverse=True)]
+
+    text_embs = search._emb([h.payload.get("combined_text","") for h in ranked])
+    picked, chosen = set(), []
+    for _i in range(min(top_k, len(ranked))):
+        best, best_score = None, -1e9
+        for idx, h in enumerate(ranked):
+            if idx in picked: continue
+            rel = float(np.dot(text_embs[idx], search._emb([q])[0]))
+            div = 0.0
+            for c in chosen:
+                div = max(div, float(np.dot(text_embs[idx], c["emb"])))
+            score = 0.72*rel - 0.28*div
+            if score > best_score:
+                best, best_score = idx, score
+        picked.add(best)
+        chosen.append({"hit": ranked[best], "emb": text_embs[best]})
+    return [c["hit"].payload for c in chosen]
+
+
+def _key(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True)
+
+
+def _ms_stats(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "mean_ms": round(mean(values), 1),
+        "p50_ms": round(values[len(values) // 2], 1),
+        "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 1),
+    }
+
+
+def run(queries: List[str], repeat: int, top_k: int) -> List[Dict[str, Any]]:
+    approaches = {"legacy": search_related_legacy, "stored-vectors": search.search_related}
+    timings: Dict[str, List[float]] = {name: [] for name in approaches}
+    overlap: List[float] = []
+
+    # warm-up: model load, qdrant open
+    for fn in approaches.values():
+        fn(queries[0], top_k=top_k)
+
+    for q in queries:
+        results = {}
+        for name, fn in approaches.items():
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                results[name] = fn(q, top_k=top_k)
+                timings[name].append((time.perf_counter() - t0) * 1000.0)
+        old = {_key(p) for p in results["legacy"]}
+        new = {_key(p) for p in results["stored-vectors"]}
+        overlap.append(len(old & new) / max(1, len(old)))
+
+    rows = []
+    for name, values in timings.items():
+        rows.append({"approach": name, **_ms_stats(values)})
+    legacy_mean = rows[0]["mean_ms"] or 1.0
+    for row in rows:
+        row["speedup"] = round(legacy_mean / (row["mean_ms"] or 1.0), 2)
+        row["result_overlap"] = round(mean(overlap), 3)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--queries", help="text file, one query per line")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args()
+
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = DEFAULT_QUERIES
+
+    rows = run(queries, args.repeat, args.top_k)
+
+    cols = list(rows[0].keys())
+    print(" | ".join(cols))
+    for row in rows:
+        print(" | ".join(str(row[c]) for c in cols))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
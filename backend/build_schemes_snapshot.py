@@ -0,0 +1,24 @@
+# build_schemes_snapshot.py
+"""
+Offline build of the SCHEMES_VECTOR_ENGINE=memory snapshot.
+
+Run from backend/ before starting (or after editing schemes.json), so no
+uvicorn worker has to open qdrant_data at startup:
+
+    python build_schemes_snapshot.py
+
+Syncs qdrant_data with schemes.json, writes schemes_index/v-<fingerprint>/
+and removes older versions. Safe to run while the server is up: it takes
+the same build lock the workers use.
+"""
+import app
+
+
+def main():
+    with app._schemes_build_lock():
+        snap_dir = app.build_schemes_snapshot()
+    print(f"✅ Snapshot ready: {snap_dir}")
+
+
+if __name__ == "__main__":
+    main()
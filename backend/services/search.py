@@ -14,16 +14,63 @@ COLL = "schemes"
 
 def _emb(x): return EMB.encode(x, normalize_embeddings=True)
 
+def candidate_vectors(hits):
+    """
+    Stored embeddings for search hits (searched with with_vectors=True), in
+    hit order. Only hits without a plain stored vector are encoded, in one batch.
+    """
+    vecs, missing = [None] * len(hits), []
+    for i, h in enumerate(hits):
+        if isinstance(h.vector, list):
+            vecs[i] = np.asarray(h.vector, dtype=np.float32)
+        else:
+            missing.append(i)
+
+    if missing:
+        encoded = _emb([hits[i].payload.get("combined_text","") for i in missing])
+        for i, v in zip(missing, encoded):
+            vecs[i] = v
+    return vecs
+
+def mmr_select(query_vec, cand_vecs, k: int, lambda_mult: float = 0.72):
+    """
+    Maximal marginal relevance over candidate vectors, fully vectorized.
+    Returns the picked candidate indices in pick order.
+    """
+    C = np.asarray(cand_vecs, dtype=np.float32)
+    n = len(C)
+    if n == 0 or k <= 0:
+        return []
+    C = C / np.clip(np.linalg.norm(C, axis=1, keepdims=True), 1e-12, None)
+    q = np.asarray(query_vec, dtype=np.float32)
+    q = q / max(float(np.linalg.norm(q)), 1e-12)
+
+    rel = C @ q
+    sims = C @ C.T                       # n x n, n is the candidate pool (~36)
+    max_sim = np.zeros(n, dtype=np.float32)  # running max similarity to picked set
+    available = np.ones(n, dtype=bool)
+
+    picked = []
+    for _ in range(min(k, n)):
+        scores = lambda_mult * rel - (1.0 - lambda_mult) * max_sim
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        np.maximum(max_sim, sims[best], out=max_sim)
+    return picked
+
 def search_related(raw_query: str, top_k=10):
     q, _ = normalize_query(raw_query)
-    vec = _emb([q])[0].tolist()
+    qvec = _emb([q])[0]
 
     hits = qdr.search(
         collection_name=COLL,
-        query_vector=vec,
+        query_vector=qvec.tolist(),
         limit=36,
         search_params=SearchParams(hnsw_ef=128, exact=False),
-        with_payload=True
+        with_payload=True,
+        with_vectors=True,
     )
     if not hits: return []
 
@@ -31,20 +78,6 @@ def search_related(raw_query: str, top_k=10):
     scores = RERANK.predict(pairs)
     ranked = [h for h,_s in sorted(zip(hits, scores), key=lambda z:z[1], reverse=True)]
 
-    # lightweight MMR diversification
-    text_embs = _emb([h.payload.get("combined_text","") for h in ranked])
-    picked, chosen = set(), []
-    for _i in range(min(top_k, len(ranked))):
-        best, best_score = None, -1e9
-        for idx, h in enumerate(ranked):
-            if idx in picked: continue
-            rel = float(np.dot(text_embs[idx], _emb([q])[0]))
-            div = 0.0
-            for c in chosen:
-                div = max(div, float(np.dot(text_embs[idx], c["emb"])))
-            score = 0.72*rel - 0.28*div
-            if score > best_score:
-                best, best_score = idx, score
-        picked.add(best)
-        chosen.append({"hit": ranked[best], "emb": text_embs[best]})
-    return [c["hit"].payload for c in chosen]
+    # lightweight MMR diversification on the stored vectors
+    picked = mmr_select(qvec, candidate_vectors(ranked), top_k, lambda_mult=0.72)
+    return [ranked[i].payload for i in picked]
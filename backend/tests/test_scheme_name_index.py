@@ -0,0 +1,51 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# app refuses to import without a key; nothing here calls Groq
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+app = pytest.importorskip("app")
+
+# (query, expected name_en substring or None for "must not short-match")
+ALIASES = [
+    ("atal awas yojna", "Atal Awas Yojana"),
+    ("अटल आवास योजना", "Atal Awas Yojana"),
+    ("pm ajay", "PM-AJAY"),
+    ("rkvy", "RKVY"),
+    ("rashtriya krishi vilas yojna", "RKVY"),  # one consonant typo, long key
+    ("handpump", "Handpump"),
+    ("pm kusum", "PM-KUSUM"),
+    ("divyang chhatravritti", "Scholarship for Disabled Students"),
+    ("pm kisan", None),  # one edit from "pm kusum", a different scheme
+    ("vidhwa pension", None),  # not in the catalog
+    ("pm ajai", None),
+]
+
+
+@pytest.fixture(scope="module")
+def name_index():
+    return app.SchemeNameIndex(app.load_schemes())
+
+
+@pytest.mark.parametrize("query,expected", ALIASES)
+def test_alias_lookup(name_index, query, expected):
+    hit = name_index.lookup(query)
+    if expected is None:
+        assert hit is None
+    else:
+        assert hit is not None and expected in hit["name_en"]
+
+
+def test_name_hit_skips_embedding(monkeypatch):
+    def no_model_call(_text):
+        raise AssertionError("query was encoded for a bare scheme name")
+
+    monkeypatch.setattr(app, "embed_scheme_query", no_model_call)
+    monkeypatch.setattr(app, "SCHEMES_NAME_FASTPATH", True)
+    ranked, exhausted = app._rank_schemes("pm kusum", 15, 0.2, None, None, None, "dense")
+    assert exhausted and len(ranked) == 1
+    assert "PM-KUSUM" in ranked[0]["name_en"]
+    assert ranked[0]["_final_score"] == app.SCHEMES_NAME_SCORE